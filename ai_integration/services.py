@@ -1,15 +1,104 @@
+import hashlib
+import io
+import json
 import logging
-import google.generativeai as genai
-from typing import Dict, Optional
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
 from django.conf import settings
+from django.core.cache import caches
+from notion_github_automation.singletons import process_singleton
 
 
 logger = logging.getLogger('gemini_service')
 
+# Strips a ```json ... ``` fence the model sometimes wraps JSON replies in
+_JSON_FENCE_RE = re.compile(r'^\s*```(?:json)?\s*|\s*```\s*$')
+
+# Prompt template for a single issue, parsed once at import rather than per issue
+_ENHANCE_TEMPLATE = """
+Create a brief, professional description for a GitHub issue entry in a Notion database. Keep it concise and to the point.
+
+GitHub Issue Information:
+- Repository: {repo_name}
+- Issue #{issue_number}: {issue_title}
+- Status: {issue_state}
+- Assignee: {assignee}
+- Labels: {labels_str}
+- GitHub URL: {html_url}
+
+Original Issue Description:
+{issue_body}
+
+Please create a concise description that:
+1. Summarizes the issue in 1-2 short paragraphs
+2. Highlights the main objective or problem
+3. Mentions key technical aspects if relevant
+4. Keeps it under 150 words total
+5. Uses simple, clear language
+
+Format it as a brief, readable summary suitable for a dashboard overview.
+""".format_map
+
+# Header lines of the non-AI description
+_BASIC_TEMPLATE = (
+    "**Issue #{issue_number}:** {issue_title}\n"
+    "**Repository:** {repo_name}\n"
+    "**Status:** {issue_state}\n"
+    "**Assignee:** {assignee}\n"
+    "**GitHub URL:** {html_url}"
+).format_map
+
+
+class SafeDict(dict):
+    """format_map mapping that leaves unknown placeholders in place"""
+    
+    def __missing__(self, key):
+        return '{' + key + '}'
+
+
+def _label_names(issue_data: Dict) -> Tuple[str, ...]:
+    """Names of an issue's labels, in GitHub order"""
+    return tuple(issue_data.get('labels', ()))
+
+
+def _template_fields(issue_data: Dict) -> SafeDict:
+    """Fields shared by the enhancement prompt and basic description templates"""
+    get = issue_data.get
+    return SafeDict(
+        repo_name=f"{get('repository_owner')}/{get('repository_name')}",
+        issue_number=get('number', 'Unknown'),
+        issue_title=get('title', ''),
+        issue_state=get('state', 'open').title(),
+        assignee=get('assignee_login', 'Not assigned'),
+        html_url=get('html_url', ''),
+    )
+
 
 class GeminiService:
     """Service class for Gemini AI interactions"""
     
+    # Issues sent per batched prompt, keeping prompt and reply well inside the model context
+    BATCH_SIZE = 20
+    
+    # Concurrent requests and 429 retries for per-issue generation
+    CONCURRENCY = 8
+    MAX_RETRIES = 4
+    
+    # Closed issues and bodies shorter than this get the basic description without a Gemini call
+    MIN_BODY_LENGTH = 120
+    
+    # In-process LRU of generated descriptions, shared by all instances and
+    # backed by the Django cache so results also survive across processes
+    CACHE_MAXSIZE = 1024
+    _memory_cache = OrderedDict()
+    _cache_lock = threading.Lock()
+    _cache_hits = 0
+    _cache_misses = 0
+    
     def __init__(self):
         self.api_key = getattr(settings, 'GEMINI_API_KEY', None)
         
@@ -19,6 +108,9 @@ class GeminiService:
             return
         
         try:
+            # Imported lazily: the Google client stack is heavy and unused when AI is disabled
+            import google.generativeai as genai
+            
             genai.configure(api_key=self.api_key)
             self.model = genai.GenerativeModel('gemini-1.5-flash')
             self.enabled = True
@@ -37,16 +129,22 @@ class GeminiService:
         Returns:
             Enhanced description string
         """
-        if not self.enabled:
+        if not self.enabled or not self._needs_ai(issue_data):
             return self._create_basic_description(issue_data)
         
         try:
             # Prepare the prompt for Gemini
             prompt = self._build_enhancement_prompt(issue_data)
+            cache_key = self._cache_key(prompt, issue_data)
+            
+            cached_description = self._get_cached_description(cache_key)
+            if cached_description is not None:
+                return cached_description
             
             # Generate enhanced description
             response = self.model.generate_content(prompt)
             enhanced_description = response.text
+            self._set_cached_description(cache_key, enhanced_description)
             
             logger.info(f"Generated enhanced description for issue #{issue_data.get('number')}")
             return enhanced_description
@@ -55,52 +153,269 @@ class GeminiService:
             logger.warning(f"Failed to generate AI description for issue #{issue_data.get('number')}: {e}")
             return self._create_basic_description(issue_data)
     
-    def _build_enhancement_prompt(self, issue_data: Dict) -> str:
+    def enhance_issues_batch(self, issues: List[Dict]) -> List[str]:
         """
-        Build a prompt for Gemini to enhance the issue description
+        Generate enhanced descriptions for many issues with one Gemini call per batch
         
         Args:
-            issue_data: GitHub issue data
+            issues: List of parsed GitHub issue data
+        
+        Returns:
+            List of descriptions in the same order as ``issues``
+        """
+        if not self.enabled:
+            return [self._create_basic_description(issue) for issue in issues]
+        
+        # Trivial issues get their basic description up front and never reach Gemini
+        cache_keys = [
+            self._cache_key(self._build_enhancement_prompt(issue), issue) if self._needs_ai(issue) else None
+            for issue in issues
+        ]
+        descriptions = [
+            self._get_cached_description(key) if key else self._create_basic_description(issue)
+            for key, issue in zip(cache_keys, issues)
+        ]
+        
+        # Only issues without a cached description go to Gemini
+        pending = [index for index, description in enumerate(descriptions) if description is None]
+        
+        for start in range(0, len(pending), self.BATCH_SIZE):
+            batch = pending[start:start + self.BATCH_SIZE]
+            generated = self._enhance_batch([issues[index] for index in batch])
+            
+            for position, index in enumerate(batch):
+                description = generated.get(position)
+                if description:
+                    self._set_cached_description(cache_keys[index], description)
+                    descriptions[index] = description
+        
+        # Issues the model skipped, or whose batch failed, are enhanced individually
+        missing = [index for index, description in enumerate(descriptions) if description is None]
+        if missing:
+            results = self.enhance_many([issues[index] for index in missing])
+            for index, result in zip(missing, results):
+                descriptions[index] = (
+                    self._create_basic_description(issues[index]) if isinstance(result, Exception) else result
+                )
+        
+        return descriptions
+    
+    def enhance_many(self, issues: List[Dict]) -> List:
+        """
+        Generate per-issue descriptions concurrently on a thread pool
+        
+        The blocking generate_content call is used so that nothing is bound to
+        an event loop, which the shared service would outlive between syncs.
+        Requests are capped at CONCURRENCY in flight to stay under the
+        per-minute quota, and rate-limited (429) calls are retried with
+        exponential backoff.
+        
+        Args:
+            issues: List of parsed GitHub issue data
+        
+        Returns:
+            List of descriptions (or raised exceptions) in the same order as ``issues``
+        """
+        if not self.enabled:
+            return [self._create_basic_description(issue) for issue in issues]
+        
+        def enhance_one(issue_data: Dict) -> str:
+            if not self._needs_ai(issue_data):
+                return self._create_basic_description(issue_data)
+            
+            prompt = self._build_enhancement_prompt(issue_data)
+            cache_key = self._cache_key(prompt, issue_data)
+            
+            cached_description = self._get_cached_description(cache_key)
+            if cached_description is not None:
+                return cached_description
+            
+            try:
+                response = self._generate_with_retry(prompt)
+            except Exception as e:
+                logger.warning(f"Failed to generate AI description for issue #{issue_data.get('number')}: {e}")
+                return self._create_basic_description(issue_data)
+            
+            self._set_cached_description(cache_key, response.text)
+            return response.text
+        
+        with ThreadPoolExecutor(max_workers=self.CONCURRENCY, thread_name_prefix='gemini') as executor:
+            futures = [executor.submit(enhance_one, issue) for issue in issues]
+            return [future.exception() or future.result() for future in futures]
+    
+    def _generate_with_retry(self, prompt: str):
+        """Call generate_content, backing off exponentially on 429 responses"""
+        for attempt in range(self.MAX_RETRIES + 1):
+            try:
+                return self.model.generate_content(prompt)
+            except Exception as e:
+                if getattr(e, 'code', None) != 429 or attempt == self.MAX_RETRIES:
+                    raise
+                delay = 2 ** attempt
+                logger.info(f"Gemini rate limit hit, retrying in {delay}s")
+                time.sleep(delay)
+    
+    def _needs_ai(self, issue_data: Dict) -> bool:
+        """Whether an issue has enough open content to be worth a Gemini call"""
+        body = issue_data.get('body') or ''
+        return issue_data.get('state') != 'closed' and len(body) >= self.MIN_BODY_LENGTH
+    
+    def _cache_key(self, prompt: str, issue_data: Dict) -> str:
+        """
+        Build the description cache key for a prompt
+        
+        The issue's updated_at timestamp is hashed along with the prompt, so
+        editing an issue on GitHub changes the key and the stale entry is never read.
+        """
+        key_source = f"{issue_data.get('updated_at')}\n{prompt}"
+        return f"gemini:description:{hashlib.md5(key_source.encode('utf-8')).hexdigest()}"
+    
+    def _get_cached_description(self, cache_key: str) -> Optional[str]:
+        """Look up a description in the in-process LRU, then the Django cache"""
+        cls = type(self)
+        
+        with cls._cache_lock:
+            description = cls._memory_cache.get(cache_key)
+            if description is not None:
+                cls._memory_cache.move_to_end(cache_key)
+        
+        if description is None:
+            try:
+                description = caches['default'].get(cache_key)
+            except Exception as e:
+                logger.debug(f"Description cache lookup failed: {e}")
+            
+            if description is not None:
+                self._remember_description(cache_key, description)
+        
+        with cls._cache_lock:
+            if description is not None:
+                cls._cache_hits += 1
+            else:
+                cls._cache_misses += 1
+            logger.debug(f"Description cache {'hit' if description is not None else 'miss'} "
+                         f"(hits={cls._cache_hits}, misses={cls._cache_misses})")
+        
+        return description
+    
+    def _set_cached_description(self, cache_key: str, description: str) -> None:
+        """Store a generated description in both cache tiers"""
+        self._remember_description(cache_key, description)
+        
+        try:
+            caches['default'].set(cache_key, description, getattr(settings, 'GEMINI_CACHE_TIMEOUT', 604800))
+        except Exception as e:
+            logger.debug(f"Description cache store failed: {e}")
+    
+    def _remember_description(self, cache_key: str, description: str) -> None:
+        """Insert into the in-process LRU, evicting the oldest entry when full"""
+        cls = type(self)
+        
+        with cls._cache_lock:
+            cls._memory_cache[cache_key] = description
+            cls._memory_cache.move_to_end(cache_key)
+            if len(cls._memory_cache) > cls.CACHE_MAXSIZE:
+                cls._memory_cache.popitem(last=False)
+    
+    def _enhance_batch(self, issues: List[Dict]) -> Dict[int, str]:
+        """
+        Enhance up to BATCH_SIZE issues with a single Gemini request
+        
+        Args:
+            issues: List of parsed GitHub issue data
+        
+        Returns:
+            Dictionary mapping position in ``issues`` to description; issues the
+            model skipped, or all of them if the request failed, are missing
+        """
+        try:
+            prompt = self._build_batch_prompt(issues)
+            response = self.model.generate_content(prompt)
+            generated = self._parse_batch_response(response.text)
+            logger.info(f"Generated {len(generated)}/{len(issues)} enhanced descriptions in one batch")
+            return generated
+        except Exception as e:
+            logger.warning(f"Failed to generate batched AI descriptions: {e}")
+            return {}
+    
+    def _build_batch_prompt(self, issues: List[Dict]) -> str:
+        """
+        Build a single prompt asking Gemini to describe several issues at once
+        
+        Args:
+            issues: List of parsed GitHub issue data
         
         Returns:
             Formatted prompt string
         """
-        repo_name = f"{issue_data.get('repository_owner')}/{issue_data.get('repository_name')}"
-        issue_title = issue_data.get('title', '')
-        issue_number = issue_data.get('number', 'Unknown')
-        issue_state = issue_data.get('state', 'open')
-        assignee = issue_data.get('assignee_login', 'Not assigned')
-        labels = [label.get('name', '') for label in issue_data.get('labels', [])]
-        issue_body = issue_data.get('body', '')
-        created_at = issue_data.get('created_at', '')
-        updated_at = issue_data.get('updated_at', '')
+        issue_entries = [
+            {
+                'id': index,
+                'repository': f"{issue.get('repository_owner')}/{issue.get('repository_name')}",
+                'number': issue.get('number'),
+                'title': issue.get('title', ''),
+                'status': issue.get('state', 'open'),
+                'assignee': issue.get('assignee_login') or 'Not assigned',
+                'labels': _label_names(issue),
+                'url': issue.get('html_url', ''),
+                'body': issue.get('body') or 'No description provided',
+            }
+            for index, issue in enumerate(issues)
+        ]
         
         prompt = f"""
-Create a brief, professional description for a GitHub issue entry in a Notion database. Keep it concise and to the point.
+Create a brief, professional description for each of the following GitHub issues. Each description is an entry in a Notion database, so keep it concise and to the point.
 
-GitHub Issue Information:
-- Repository: {repo_name}
-- Issue #{issue_number}: {issue_title}
-- Status: {issue_state.title()}
-- Assignee: {assignee}
-- Labels: {', '.join(labels) if labels else 'None'}
-- GitHub URL: {issue_data.get('html_url', '')}
+GitHub Issues (JSON):
+{json.dumps(issue_entries, indent=2, default=str)}
 
-Original Issue Description:
-{issue_body if issue_body else 'No description provided'}
-
-Please create a concise description that:
+For each issue, create a concise description that:
 1. Summarizes the issue in 1-2 short paragraphs
 2. Highlights the main objective or problem
 3. Mentions key technical aspects if relevant
 4. Keeps it under 150 words total
 5. Uses simple, clear language
 
-Format it as a brief, readable summary suitable for a dashboard overview.
+Respond with only a JSON array containing one object per issue, in this form:
+[{{"id": <issue id>, "description": "<markdown description>"}}]
 """
         
         return prompt
     
+    def _parse_batch_response(self, text: str) -> Dict[int, str]:
+        """
+        Parse Gemini's JSON reply to a batch prompt
+        
+        Args:
+            text: Raw response text
+        
+        Returns:
+            Dictionary mapping batch-local issue id to description
+        """
+        entries = json.loads(_JSON_FENCE_RE.sub('', text))
+        
+        return {
+            int(entry['id']): entry['description']
+            for entry in entries
+            if isinstance(entry, dict) and entry.get('description')
+        }
+    
+    def _build_enhancement_prompt(self, issue_data: Dict) -> str:
+        """
+        Build a prompt for Gemini to enhance the issue description
+        
+        Args:
+            issue_data: GitHub issue data
+        
+        Returns:
+            Formatted prompt string
+        """
+        fields = _template_fields(issue_data)
+        fields['labels_str'] = ', '.join(_label_names(issue_data)) or 'None'
+        fields['issue_body'] = issue_data.get('body') or 'No description provided'
+        
+        return _ENHANCE_TEMPLATE(fields)
+    
     def _create_basic_description(self, issue_data: Dict) -> str:
         """
         Create a basic description without AI enhancement
@@ -111,31 +426,22 @@ Format it as a brief, readable summary suitable for a dashboard overview.
         Returns:
             Basic formatted description
         """
-        repo_name = f"{issue_data.get('repository_owner')}/{issue_data.get('repository_name')}"
-        issue_title = issue_data.get('title', '')
-        issue_number = issue_data.get('number', 'Unknown')
-        issue_state = issue_data.get('state', 'open')
-        assignee = issue_data.get('assignee_login', 'Not assigned')
-        labels = [label.get('name', '') for label in issue_data.get('labels', [])]
-        
-        description_parts = [
-            f"**Issue #{issue_number}:** {issue_title}",
-            f"**Repository:** {repo_name}",
-            f"**Status:** {issue_state.title()}",
-            f"**Assignee:** {assignee}",
-            f"**GitHub URL:** {issue_data.get('html_url', '')}",
-        ]
+        labels = _label_names(issue_data)
+        
+        description = io.StringIO()
+        description.write(_BASIC_TEMPLATE(_template_fields(issue_data)))
         
         if labels:
-            description_parts.append(f"**Labels:** {', '.join(labels)}")
+            description.write(f"\n**Labels:** {', '.join(labels)}")
         
-        if issue_data.get('body'):
-            body_preview = issue_data.get('body')[:300]
-            if len(issue_data.get('body', '')) > 300:
+        issue_body = issue_data.get('body')
+        if issue_body:
+            body_preview = issue_body[:300]
+            if len(issue_body) > 300:
                 body_preview += "..."
-            description_parts.append(f"**Description:**\n{body_preview}")
+            description.write(f"\n**Description:**\n{body_preview}")
         
-        return "\n".join(description_parts)
+        return description.getvalue()
     
     def summarize_repository_activity(self, issues: list) -> str:
         """
@@ -180,3 +486,9 @@ Keep it professional and informative for a project dashboard.
         except Exception as e:
             logger.warning(f"Failed to generate repository summary: {e}")
             return f"Repository {repo_name} has {len(issues)} assigned issues"
+
+
+@process_singleton
+def get_gemini_service() -> GeminiService:
+    """Return the process-wide GeminiService, so the Google client is configured once per worker"""
+    return GeminiService()
@@ -88,7 +88,7 @@ class Command(BaseCommand):
                     f'Sync completed successfully!\n'
                     f'Issues processed: {sync_result.issues_processed}\n'
                     f'Issues synced: {sync_result.issues_synced}\n'
-                    f'Duration: {sync_result.completed_at - sync_result.started_at}'
+                    f'Duration: {sync_result.duration}'
                 )
             )
         elif sync_result.status == 'partial':
@@ -98,14 +98,14 @@ class Command(BaseCommand):
                     f'Issues processed: {sync_result.issues_processed}\n'
                     f'Issues synced: {sync_result.issues_synced}\n'
                     f'Errors: {sync_result.errors_count}\n'
-                    f'Error messages:\n{chr(10).join(sync_result.error_messages)}'
+                    f'Error messages:\n{sync_result.error_messages}'
                 )
             )
         else:
             self.stdout.write(
                 self.style.ERROR(
                     f'Sync failed!\n'
-                    f'Error: {chr(10).join(sync_result.error_messages)}'
+                    f'Error: {sync_result.error_messages}'
                 )
             )
     
@@ -151,7 +151,7 @@ class Command(BaseCommand):
             )
         else:
             self.stdout.write(
-                self.style.ERROR(f'Repository sync failed: {chr(10).join(sync_result.error_messages)}')
+                self.style.ERROR(f'Repository sync failed: {sync_result.error_messages}')
             )
     
     def test_connections(self, automation_service):
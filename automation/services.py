@@ -1,53 +1,83 @@
+import hashlib
+import io
+import json
 import logging
-from datetime import datetime
-from typing import List, Dict, Tuple
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
-from github_integration.services import GitHubService
+from django.conf import settings
+
+from github_integration.services import get_github_service
+from notion_integration.local_cache import SyncedPage, get_synced_page_store
 from notion_integration.services import NotionService
 
 
 logger = logging.getLogger('automation')
 
+# owner, repo and issue number of a GitHub issue URL (query strings/fragments ignored)
+_GH_URL = re.compile(r'^https?://github\.com/([^/?#]+)/([^/?#]+)/issues/(\d+)')
+
 
 class SyncResult:
     """Simple class to track sync results without database"""
     def __init__(self, sync_type: str = 'manual'):
         self.sync_type = sync_type
-        self.started_at = datetime.now()
+        self.started_at = datetime.now()  # wall-clock, for display only
         self.completed_at = None
+        self._start_mono = time.monotonic()
+        self._end_mono = None
         self.issues_processed = 0
         self.issues_synced = 0
         self.errors_count = 0
-        self.error_messages = []
+        self._errors = io.StringIO()
         self.status = 'running'
     
     @property
     def duration(self):
-        """Calculate sync duration"""
-        end_time = self.completed_at or datetime.now()
-        return end_time - self.started_at
+        """Calculate sync duration from the monotonic clock"""
+        end_mono = self._end_mono if self._end_mono is not None else time.monotonic()
+        return timedelta(seconds=end_mono - self._start_mono)
     
-    def mark_completed(self):
-        self.status = 'completed'
+    def _finish(self, status):
+        self.status = status
+        self._end_mono = time.monotonic()
         self.completed_at = datetime.now()
     
+    def mark_completed(self):
+        self._finish('completed')
+    
+    def mark_partial(self):
+        self._finish('partial')
+    
     def mark_failed(self, error_message=''):
-        self.status = 'failed'
-        self.completed_at = datetime.now()
+        self._finish('failed')
         if error_message:
-            self.error_messages.append(error_message)
+            self._write_error(error_message)
     
     def add_error(self, error_message):
         self.errors_count += 1
-        self.error_messages.append(error_message)
+        self._write_error(error_message)
+    
+    def _write_error(self, error_message):
+        self._errors.write(error_message)
+        self._errors.write('\n')
+    
+    @property
+    def error_messages(self) -> str:
+        """All recorded error messages, one per line"""
+        return self._errors.getvalue()
 
 
 class AutomationService:
     """Main service for orchestrating GitHub to Notion synchronization"""
     
     def __init__(self):
-        self.github_service = GitHubService()
+        self.github_service = get_github_service()
         self.notion_service = NotionService()
+        self.synced_pages = get_synced_page_store()
     
     def sync_assigned_issues(self, sync_type: str = 'manual', state: str = 'open') -> SyncResult:
         """
@@ -67,31 +97,28 @@ class AutomationService:
         try:
             # Fetch assigned issues from GitHub (only open issues by default)
             github_issues = self.github_service.get_assigned_issues(state=state)
-            sync_result.issues_processed = len(github_issues)
-            
             logger.info(f"Processing {len(github_issues)} GitHub issues")
             
-            synced_count = 0
+            url_index = self._build_url_index()
+            pending, unchanged_count = self._plan_sync(github_issues, sync_result, url_index)
             
-            for issue_data in github_issues:
-                try:
-                    success = self._process_single_issue(issue_data)
-                    if success:
-                        synced_count += 1
-                    
-                except Exception as e:
-                    error_msg = f"Failed to process issue #{issue_data.get('id')}: {str(e)}"
-                    logger.error(error_msg)
-                    sync_result.add_error(error_msg)
+            # Only issues that will actually be written cost Gemini quota
+            descriptions = self._enhance_descriptions([parsed_data for _, parsed_data, _ in pending])
+            
+            # Notion round-trips dominate, so write the issues concurrently
+            if url_index is not None:
+                written_count = self._write_in_batches(pending, descriptions)
+            else:
+                written_count = self._write_concurrently(pending, sync_result, descriptions)
             
+            synced_count = unchanged_count + written_count
             sync_result.issues_synced = synced_count
             
             if sync_result.errors_count == 0:
                 sync_result.mark_completed()
                 logger.info(f"Sync completed successfully. {synced_count}/{len(github_issues)} issues synced")
             else:
-                sync_result.status = 'partial'
-                sync_result.completed_at = datetime.now()
+                sync_result.mark_partial()
                 logger.warning(f"Sync completed with errors. {synced_count}/{len(github_issues)} issues synced")
         
         except Exception as e:
@@ -101,12 +128,213 @@ class AutomationService:
         
         return sync_result
     
-    def _process_single_issue(self, github_issue_data: Dict) -> bool:
+    def _build_url_index(self) -> Optional[Dict[str, str]]:
+        """
+        Index existing Notion pages by issue URL with one paginated scan
+        
+        Returns:
+            Dictionary mapping issue URL to page ID, or None if the scan failed
+            (callers then fall back to searching Notion per issue)
+        """
+        try:
+            return self.notion_service.prefetch_url_index()
+        except Exception as e:
+            logger.warning(f"Failed to index Notion pages, falling back to per-issue search: {e}")
+            return None
+    
+    def _plan_sync(self, github_issues: List[Dict], sync_result: SyncResult,
+                   url_index: Optional[Dict[str, str]]) -> Tuple[List[Tuple[Optional[str], Dict, bytes]], int]:
+        """
+        Parse issues once and split off those whose Notion page is already current
+        
+        Args:
+            github_issues: Raw GitHub API issue data
+            sync_result: Sync tracker that processed issues are recorded on
+            url_index: Optional issue URL -> Notion page ID index; without it
+                pages are resolved from the local mirror
+        
+        Returns:
+            Tuple of (issues to write as (page_id, parsed_data, digest) tuples,
+            number of unchanged issues skipped); page_id is None when no page is known
+        """
+        parsed_issues = []
+        
+        for issue_data in github_issues:
+            sync_result.issues_processed += 1
+            parsed_data = self.github_service.parse_issue_data(issue_data)
+            
+            if not parsed_data.get('github_id'):
+                logger.warning("Issue missing GitHub ID, skipping")
+                continue
+            parsed_issues.append(parsed_data)
+        
+        synced_pages = self.synced_pages.get_many(issue['github_id'] for issue in parsed_issues)
+        pending = []
+        unchanged_count = 0
+        
+        for parsed_data in parsed_issues:
+            github_id = parsed_data['github_id']
+            synced_page = synced_pages.get(github_id)
+            page_id = self._resolve_page_id(parsed_data, synced_page, url_index)
+            digest = self._issue_digest(parsed_data)
+            
+            if self._is_unchanged(synced_page, page_id, parsed_data, digest):
+                logger.info(f"Issue #{github_id} unchanged since last sync, skipping")
+                unchanged_count += 1
+            else:
+                pending.append((page_id, parsed_data, digest))
+        
+        return pending, unchanged_count
+    
+    def _enhance_descriptions(self, parsed_issues: List[Dict]) -> Dict[int, str]:
+        """
+        Generate AI descriptions for the issues about to be written
+        
+        Issues are sent to Gemini in batched prompts, or as concurrent
+        per-issue prompts when GEMINI_BATCH_PROMPTS is disabled.
+        
+        Args:
+            parsed_issues: Parsed GitHub issue data
+        
+        Returns:
+            Dictionary mapping GitHub issue ID to description (empty on failure,
+            in which case descriptions are generated per issue)
+        """
+        if not parsed_issues:
+            return {}
+        
+        try:
+            gemini_service = self.notion_service.gemini_service
+            
+            if getattr(settings, 'GEMINI_BATCH_PROMPTS', True):
+                descriptions = gemini_service.enhance_issues_batch(parsed_issues)
+            else:
+                descriptions = gemini_service.enhance_many(parsed_issues)
+            
+            return {
+                issue['github_id']: description
+                for issue, description in zip(parsed_issues, descriptions)
+                if not isinstance(description, Exception)
+            }
+        except Exception as e:
+            logger.warning(f"Failed to batch AI descriptions, falling back to per-issue generation: {e}")
+            return {}
+    
+    def _write_in_batches(self, pending: List[Tuple[Optional[str], Dict, bytes]],
+                          descriptions: Dict[int, str]) -> int:
+        """
+        Split pending issues into creates and updates and send each group to Notion concurrently
+        
+        Args:
+            pending: (page_id, parsed_data, digest) tuples from _plan_sync
+            descriptions: GitHub issue ID -> pre-generated description
+        
+        Returns:
+            Number of issues written successfully
+        """
+        digests = {parsed_data['github_id']: digest for _, parsed_data, digest in pending}
+        to_create = [
+            (parsed_data, descriptions.get(parsed_data['github_id']))
+            for page_id, parsed_data, _ in pending if not page_id
+        ]
+        to_update = [
+            (page_id, parsed_data, descriptions.get(parsed_data['github_id']))
+            for page_id, parsed_data, _ in pending if page_id
+        ]
+        
+        created = self.notion_service.bulk_create_issue_pages(to_create) if to_create else []
+        updated = self.notion_service.bulk_update_issue_pages(to_update) if to_update else []
+        
+        written = [(page_id, parsed_data) for (parsed_data, _), page_id in zip(to_create, created) if page_id]
+        written += [(page_id, parsed_data) for (page_id, parsed_data, _), success in zip(to_update, updated) if success]
+        
+        self.synced_pages.upsert_many(
+            (parsed_data['github_id'], page_id, str(parsed_data.get('updated_at') or ''), digests[parsed_data['github_id']])
+            for page_id, parsed_data in written
+        )
+        
+        return len(written)
+    
+    def _write_concurrently(self, pending: List[Tuple[Optional[str], Dict, bytes]],
+                            sync_result: SyncResult, descriptions: Dict[int, str]) -> int:
+        """
+        Upsert pending issues one by one on a thread pool, bounded by SYNC_CONCURRENCY
+        
+        Args:
+            pending: (page_id, parsed_data, digest) tuples from _plan_sync
+            sync_result: Sync tracker that failures are recorded on
+            descriptions: GitHub issue ID -> pre-generated description
+        
+        Returns:
+            Number of issues written successfully
+        """
+        synced_count = 0
+        max_workers = int(getattr(settings, 'SYNC_CONCURRENCY', 16))
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(
+                    self._write_issue, parsed_data, page_id, digest, descriptions.get(parsed_data['github_id'])
+                ): parsed_data
+                for page_id, parsed_data, digest in pending
+            }
+            
+            for future in as_completed(futures):
+                try:
+                    if future.result():
+                        synced_count += 1
+                except Exception as e:
+                    error_msg = f"Failed to process issue #{futures[future]['github_id']}: {str(e)}"
+                    logger.error(error_msg)
+                    sync_result.add_error(error_msg)
+        
+        return synced_count
+    
+    def _process_issues(self, github_issues: Iterable[Dict], sync_result: SyncResult,
+                        url_index: Optional[Dict[str, str]] = None) -> int:
+        """
+        Process issues on a thread pool, bounded by the SYNC_CONCURRENCY setting
+        
+        The GitHub and Notion clients are blocking, but requests/httpx release
+        the GIL while waiting on sockets, so round-trips overlap across threads.
+        
+        Args:
+            github_issues: Raw GitHub API issue data (any iterable, consumed lazily)
+            sync_result: Sync tracker that processed issues and failures are recorded on
+            url_index: Optional issue URL -> Notion page ID index
+        
+        Returns:
+            Number of issues synced successfully
+        """
+        synced_count = 0
+        max_workers = int(getattr(settings, 'SYNC_CONCURRENCY', 16))
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {}
+            for issue_data in github_issues:
+                sync_result.issues_processed += 1
+                futures[executor.submit(self._process_single_issue, issue_data, url_index)] = issue_data
+            
+            for future in as_completed(futures):
+                try:
+                    if future.result():
+                        synced_count += 1
+                except Exception as e:
+                    error_msg = f"Failed to process issue #{futures[future].get('id')}: {str(e)}"
+                    logger.error(error_msg)
+                    sync_result.add_error(error_msg)
+        
+        return synced_count
+    
+    def _process_single_issue(self, github_issue_data: Dict,
+                              url_index: Optional[Dict[str, str]] = None) -> bool:
         """
         Process a single GitHub issue and sync directly to Notion
         
         Args:
             github_issue_data: Raw GitHub API issue data
+            url_index: Optional issue URL -> Notion page ID index; when omitted
+                the page is looked up with a Notion search
         
         Returns:
             True if successful, False otherwise
@@ -120,36 +348,95 @@ class AutomationService:
                 logger.warning("Issue missing GitHub ID, skipping")
                 return False
             
-            # Check if issue already exists in Notion by using the issue URL
-            issue_url = parsed_data.get('html_url', '')
-            existing_pages = self.notion_service.search_pages_by_issue_url(issue_url)
+            synced_page = self.synced_pages.get(github_id)
+            page_id = self._resolve_page_id(parsed_data, synced_page, url_index)
+            
+            # Skip Notion entirely when the parsed issue matches what was last written
+            digest = self._issue_digest(parsed_data)
+            if self._is_unchanged(synced_page, page_id, parsed_data, digest):
+                logger.info(f"Issue #{github_id} unchanged since last sync, skipping")
+                return True
+            
+            return self._write_issue(parsed_data, page_id, digest)
             
-            if existing_pages:
-                # Update existing Notion page
-                page_id = existing_pages[0]['id']
-                success = self.notion_service.update_issue_page(page_id, parsed_data)
-                
-                if success:
-                    logger.info(f"Updated existing Notion page for issue #{github_id}")
-                    return True
-                else:
-                    logger.warning(f"Failed to update Notion page for issue #{github_id}")
-                    return False
-            else:
-                # Create new Notion page
-                page_id = self.notion_service.create_issue_page(parsed_data)
-                
-                if page_id:
-                    logger.info(f"Created new Notion page for issue #{github_id}")
-                    return True
-                else:
-                    logger.warning(f"Failed to create Notion page for issue #{github_id}")
-                    return False
-                
         except Exception as e:
             logger.error(f"Failed to process issue: {e}")
             raise
     
+    def _write_issue(self, parsed_data: Dict, page_id: Optional[str], digest: bytes,
+                     description: Optional[str] = None) -> bool:
+        """
+        Create or update one issue's Notion page and record it in the local mirror
+        
+        Args:
+            parsed_data: Parsed issue dictionary
+            page_id: Page to update, or None to let upsert_issue look it up
+            digest: Digest of parsed_data from _issue_digest
+            description: Optional pre-generated description
+        
+        Returns:
+            True if the page was written, False otherwise
+        """
+        github_id = parsed_data['github_id']
+        page_id, created = self.notion_service.upsert_issue(parsed_data, description, page_id)
+        
+        if page_id:
+            self.synced_pages.upsert(github_id, page_id, str(parsed_data.get('updated_at') or ''), digest)
+            logger.info(f"{'Created new' if created else 'Updated existing'} Notion page for issue #{github_id}")
+            return True
+        
+        logger.warning(f"Failed to {'create' if created else 'update'} Notion page for issue #{github_id}")
+        return False
+    
+    @staticmethod
+    def _resolve_page_id(parsed_data: Dict, synced_page: Optional[SyncedPage],
+                         url_index: Optional[Dict[str, str]]) -> Optional[str]:
+        """
+        Find the Notion page an issue should be written to
+        
+        A freshly loaded URL index wins; without one the local mirror is trusted,
+        and None leaves upsert_issue to look the page up.
+        """
+        if url_index is not None:
+            return url_index.get(parsed_data.get('html_url', ''))
+        return synced_page.page_id if synced_page else None
+    
+    @staticmethod
+    def _issue_digest(parsed_data: Dict) -> bytes:
+        """
+        Compute a stable digest of everything written to the Notion page
+        
+        Args:
+            parsed_data: Parsed issue dictionary
+        
+        Returns:
+            Digest identifying this issue's content
+        """
+        payload = json.dumps(parsed_data, sort_keys=True, default=str)
+        return hashlib.blake2b(payload.encode(), digest_size=16).digest()
+    
+    @staticmethod
+    def _is_unchanged(synced_page: Optional[SyncedPage], page_id: Optional[str],
+                      parsed_data: Dict, digest: bytes) -> bool:
+        """
+        Check whether an issue's Notion page already holds its current content
+        
+        Args:
+            synced_page: Mirror row from the last successful write, if any
+            page_id: Notion page the issue would be written to
+            parsed_data: Parsed issue dictionary
+            digest: Digest of parsed_data from _issue_digest
+        
+        Returns:
+            True if the page is the mirrored one and the issue has not changed since
+        """
+        if not synced_page or not page_id or synced_page.page_id != page_id:
+            return False
+        
+        # GitHub bumps updated_at on every edit, so an unchanged stamp needs no hashing
+        updated_at = str(parsed_data.get('updated_at') or '')
+        return (bool(updated_at) and updated_at <= synced_page.updated_at) or synced_page.body_hash == digest
+    
     def sync_single_issue_by_url(self, github_url: str) -> Tuple[bool, str]:
         """
         Sync a single issue by GitHub URL
@@ -162,13 +449,11 @@ class AutomationService:
         """
         try:
             # Parse GitHub URL to extract owner, repo, and issue number
-            url_parts = github_url.strip('/').split('/')
-            if len(url_parts) < 4 or 'github.com' not in github_url:
+            match = _GH_URL.match(github_url)
+            if not match:
                 return False, "Invalid GitHub URL format"
             
-            owner = url_parts[-4]
-            repo = url_parts[-3]
-            issue_number = int(url_parts[-1])
+            owner, repo, issue_number = match.group(1), match.group(2), int(match.group(3))
             
             # Fetch issue data from GitHub
             github_data = self.github_service.get_issue_by_id(owner, repo, issue_number)
@@ -204,58 +489,50 @@ class AutomationService:
         try:
             logger.info(f"Syncing issues from {owner}/{repo} assigned to {assignee}")
             
-            # Get all issues for the repository
-            all_issues = []
-            page = 1
+            url_index = self._build_url_index()
             
-            while True:
-                params = {
-                    "assignee": assignee,
-                    "state": "all",
-                    "per_page": 100,
-                    "page": page,
-                    "sort": "updated",
-                    "direction": "desc"
-                }
-                
-                url = f"{self.github_service.base_url}/repos/{owner}/{repo}/issues"
-                issues_data = self.github_service._make_request(url, params)
-                
-                if not issues_data:
-                    break
-                
-                all_issues.extend(issues_data)
-                
-                if len(issues_data) < 100:
-                    break
-                
-                page += 1
-            
-            sync_result.issues_processed = len(all_issues)
-            synced_count = 0
-            
-            for issue_data in all_issues:
-                try:
-                    success = self._process_single_issue(issue_data)
-                    if success:
-                        synced_count += 1
-                except Exception as e:
-                    error_msg = f"Failed to process issue #{issue_data.get('id')}: {str(e)}"
-                    sync_result.add_error(error_msg)
+            # Pages stream straight into the worker pool, so processing overlaps
+            # with fetching the remaining pages
+            synced_count = self._process_issues(
+                self._iter_repo_issues(owner, repo, assignee), sync_result, url_index
+            )
             
             sync_result.issues_synced = synced_count
             
             if sync_result.errors_count == 0:
                 sync_result.mark_completed()
             else:
-                sync_result.status = 'partial'
-                sync_result.completed_at = datetime.now()
+                sync_result.mark_partial()
             
         except Exception as e:
             sync_result.mark_failed(str(e))
         
         return sync_result
     
+    def _iter_repo_issues(self, owner: str, repo: str, assignee: str) -> Iterator[Dict]:
+        """
+        Yield a repository's issues page by page instead of collecting them all
+        
+        Args:
+            owner: Repository owner
+            repo: Repository name
+            assignee: Assignee to filter by
+        
+        Yields:
+            Raw GitHub API issue data
+        """
+        params = {
+            "assignee": assignee,
+            "state": "all",
+            "per_page": 100,
+            "sort": "updated",
+            "direction": "desc"
+        }
+        url = f"{self.github_service.base_url}/repos/{owner}/{repo}/issues"
+        
+        for issues_data in self.github_service._iter_pages(url, params):
+            yield from issues_data
+    
     def get_sync_status(self) -> Dict:
         """
         Get current sync status and statistics (without database)
@@ -264,11 +541,12 @@ class AutomationService:
             Dictionary with sync statistics
         """
         try:
-            # Get GitHub API rate limit info
-            rate_limit = self.github_service.check_api_rate_limit()
-            
-            # Get basic info about assigned issues
-            github_issues = self.github_service.get_assigned_issues(per_page=1)
+            # Both probes are independent GitHub calls, so run them side by side
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                rate_limit_future = executor.submit(self.github_service.check_api_rate_limit)
+                issues_future = executor.submit(self.github_service.get_assigned_issues, per_page=1)
+                rate_limit = rate_limit_future.result()
+                github_issues = issues_future.result()
             
             return {
                 'github_issues_available': len(github_issues) if github_issues else 0,
@@ -295,9 +573,14 @@ class AutomationService:
             'overall': 'unknown'
         }
         
+        # GitHub and Notion checks are independent, so probe both at once
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            github_future = executor.submit(self.github_service.check_api_rate_limit)
+            notion_future = executor.submit(self.notion_service.get_database_info, refresh=True)
+        
         # Test GitHub connection
         try:
-            rate_limit = self.github_service.check_api_rate_limit()
+            rate_limit = github_future.result()
             results['github']['status'] = 'success'
             results['github']['message'] = f"Connected. Rate limit: {rate_limit['resources']['core']['remaining']}/{rate_limit['resources']['core']['limit']}"
         except Exception as e:
@@ -306,7 +589,7 @@ class AutomationService:
         
         # Test Notion connection
         try:
-            database_info = self.notion_service.get_database_info()
+            database_info = notion_future.result()
             database_title = database_info.get('title', [{}])[0].get('plain_text', 'Unnamed')
             results['notion']['status'] = 'success'
             results['notion']['message'] = f"Connected to database: {database_title}"
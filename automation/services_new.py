@@ -113,31 +113,16 @@ class AutomationService:
                 logger.warning("Issue missing GitHub ID, skipping")
                 return False
             
-            # Check if issue already exists in Notion
-            existing_pages = self.notion_service.search_pages_by_issue_id(github_id)
+            # Create the issue's Notion page, or update it if one already exists
+            page_id, created = self.notion_service.upsert_issue(parsed_data)
             
-            if existing_pages:
-                # Update existing Notion page
-                page_id = existing_pages[0]['id']
-                success = self.notion_service.update_issue_page(page_id, parsed_data)
-                
-                if success:
-                    logger.info(f"Updated existing Notion page for issue #{github_id}")
-                    return True
-                else:
-                    logger.warning(f"Failed to update Notion page for issue #{github_id}")
-                    return False
+            if page_id:
+                logger.info(f"{'Created new' if created else 'Updated existing'} Notion page for issue #{github_id}")
+                return True
             else:
-                # Create new Notion page
-                page_id = self.notion_service.create_issue_page(parsed_data)
-                
-                if page_id:
-                    logger.info(f"Created new Notion page for issue #{github_id}")
-                    return True
-                else:
-                    logger.warning(f"Failed to create Notion page for issue #{github_id}")
-                    return False
-                
+                logger.warning(f"Failed to {'create' if created else 'update'} Notion page for issue #{github_id}")
+                return False
+            
         except Exception as e:
             logger.error(f"Failed to process issue: {e}")
             raise
@@ -298,7 +283,7 @@ class AutomationService:
         
         # Test Notion connection
         try:
-            database_info = self.notion_service.get_database_info()
+            database_info = self.notion_service.get_database_info(refresh=True)
             database_title = database_info.get('title', [{}])[0].get('plain_text', 'Unnamed')
             results['notion']['status'] = 'success'
             results['notion']['message'] = f"Connected to database: {database_title}"
@@ -0,0 +1,186 @@
+import logging
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
+
+from django.core.cache import cache
+
+from automation.services import AutomationService, SyncResult
+
+
+logger = logging.getLogger('automation')
+
+# Held while a background sync is pending or running so overlapping triggers
+# are folded into it
+SYNC_LOCK_KEY = 'sync-lock'
+
+# Locks expire so a crashed worker can't block syncs for good; a paced sync of a
+# large backlog (3 Notion requests/s plus Gemini) takes well over five minutes
+SYNC_LOCK_TIMEOUT = 1800
+
+# Widest state asked for by triggers folded into the background sync; the worker
+# runs again to cover it
+SYNC_RERUN_KEY = 'sync-rerun'
+
+# Held per issue state while any sync of that state runs, whatever triggered it
+SYNC_RUN_LOCK_KEY = 'sync:{state}'
+# Set when a sync of a state is requested while one is running; that one repeats
+SYNC_RUN_RERUN_KEY = 'sync:rerun:{state}'
+SYNC_LAST_RESULT_KEY = 'sync:last:{state}'
+
+# Single worker: background syncs run one at a time, off the request thread
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='sync-worker')
+
+
+def _widest_state(state: Optional[str], other: Optional[str]) -> Optional[str]:
+    """Narrowest state covering both ('open' and 'closed' together need 'all')"""
+    if state is None or state == other:
+        return other
+    if other is None:
+        return state
+    return 'all'
+
+
+def _pop_rerun_state() -> Optional[str]:
+    """Take the state requested by folded triggers, if any"""
+    state = cache.get(SYNC_RERUN_KEY)
+    if state is not None:
+        cache.delete(SYNC_RERUN_KEY)
+    return state
+
+
+def _release_lock(key: str, token: str) -> None:
+    """Delete a lock unless it has since expired and been taken by another run"""
+    if cache.get(key) == token:
+        cache.delete(key)
+
+
+def run_locked_sync(sync_type: str = 'manual', state: str = 'open') -> Optional[SyncResult]:
+    """
+    Run a sync unless another sync of the same state is already in progress
+    
+    A request that finds a sync running makes that sync repeat once it
+    finishes, so changes made after it fetched from GitHub still reach Notion.
+    The outcome is stored under SYNC_LAST_RESULT_KEY so callers that were
+    deduplicated can report the most recent result instead.
+    
+    Args:
+        sync_type: Type of sync ('manual', 'scheduled', 'webhook')
+        state: Issue state to sync ('open', 'closed', 'all')
+    
+    Returns:
+        SyncResult instance, or None if a sync of this state was already running
+    """
+    lock_key = SYNC_RUN_LOCK_KEY.format(state=state)
+    rerun_key = SYNC_RUN_RERUN_KEY.format(state=state)
+    token = uuid.uuid4().hex
+    
+    while not cache.add(lock_key, token, timeout=SYNC_LOCK_TIMEOUT):
+        cache.set(rerun_key, sync_type, timeout=SYNC_LOCK_TIMEOUT)
+        
+        # If the running sync released the lock meanwhile it may have missed
+        # the request, so try to run it here instead
+        if cache.get(lock_key) is not None:
+            logger.info(f"A {state} sync is already running, it will run again for this {sync_type} sync")
+            return None
+    
+    try:
+        while True:
+            cache.delete(rerun_key)
+            result = AutomationService().sync_assigned_issues(sync_type, state)
+            cache.set(SYNC_LAST_RESULT_KEY.format(state=state), {
+                'sync_type': result.sync_type,
+                'status': result.status,
+                'issues_processed': result.issues_processed,
+                'issues_synced': result.issues_synced,
+                'duration': str(result.duration),
+                'completed_at': result.completed_at.isoformat() if result.completed_at else None,
+            }, timeout=None)
+            
+            # Release before checking for requests made during the run: one
+            # arriving after the check then finds the lock free and runs itself
+            _release_lock(lock_key, token)
+            if cache.get(rerun_key) is None or not cache.add(lock_key, token, timeout=SYNC_LOCK_TIMEOUT):
+                return result
+            logger.info(f"Another {state} sync was requested during this one, running again")
+    finally:
+        _release_lock(lock_key, token)
+
+
+def get_last_sync_result(state: str) -> Optional[Dict]:
+    """Summary of the most recent finished sync of a state, if any"""
+    return cache.get(SYNC_LAST_RESULT_KEY.format(state=state))
+
+
+def sync_assigned_issues_task(sync_type: str = 'webhook', state: str = 'open', countdown: float = 0,
+                              lock_token: Optional[str] = None) -> Optional[SyncResult]:
+    """
+    Run a full assigned-issue sync and release the sync lock afterwards
+    
+    Triggers folded in while the sync runs make it run once more, covering the
+    widest state they asked for.
+    
+    Args:
+        sync_type: Type of sync ('manual', 'scheduled', 'webhook')
+        state: Issue state to sync ('open', 'closed', 'all')
+        countdown: Seconds to wait before syncing; triggers arriving meanwhile
+            are folded into this sync, so a burst becomes one sync
+        lock_token: Value enqueue_sync stored under SYNC_LOCK_KEY
+    
+    Returns:
+        SyncResult of the last run, or None if a sync of the state was already running
+    """
+    try:
+        if countdown:
+            time.sleep(countdown)
+        
+        # A trigger during the countdown may have widened the state to sync
+        state = _widest_state(state, _pop_rerun_state())
+        while True:
+            result = run_locked_sync(sync_type, state)
+            if result is not None:
+                logger.info(f"Background {sync_type} sync finished: {result.issues_synced}/{result.issues_processed} issues synced")
+            
+            # Release before checking for folded triggers: one arriving after the
+            # check then finds the lock free and queues its own sync
+            _release_lock(SYNC_LOCK_KEY, lock_token)
+            state = _pop_rerun_state()
+            if state is None or not cache.add(SYNC_LOCK_KEY, lock_token, timeout=SYNC_LOCK_TIMEOUT):
+                return result
+            logger.info(f"Triggers arrived during the sync, running again for {state} issues")
+    except Exception as e:
+        logger.error(f"Background {sync_type} sync failed: {e}")
+        raise
+    finally:
+        _release_lock(SYNC_LOCK_KEY, lock_token)
+
+
+def enqueue_sync(sync_type: str = 'webhook', state: str = 'open', countdown: float = 0) -> bool:
+    """
+    Queue a sync on the background worker unless one is already pending or running
+    
+    A trigger that finds a sync pending or running is folded into it rather than
+    dropped: that sync runs again afterwards to cover this trigger's state.
+    
+    Args:
+        sync_type: Type of sync ('manual', 'scheduled', 'webhook')
+        state: Issue state to sync ('open', 'closed', 'all')
+        countdown: Seconds the worker waits before starting the sync
+    
+    Returns:
+        True if a new sync was queued, False if the trigger was folded into the
+        pending or running one
+    """
+    lock_token = uuid.uuid4().hex
+    while not cache.add(SYNC_LOCK_KEY, lock_token, timeout=SYNC_LOCK_TIMEOUT):
+        cache.set(SYNC_RERUN_KEY, _widest_state(cache.get(SYNC_RERUN_KEY), state), timeout=SYNC_LOCK_TIMEOUT)
+        
+        # If the worker released the lock meanwhile it may have missed the
+        # request, so try to queue a sync of our own instead
+        if cache.get(SYNC_LOCK_KEY) is not None:
+            logger.info(f"Sync already running, folding {sync_type} {state} sync into it")
+            return False
+    
+    _executor.submit(sync_assigned_issues_task, sync_type, state, countdown, lock_token)
+    return True
@@ -1,34 +1,102 @@
-from django.http import JsonResponse, HttpResponse
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import HttpResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
-from automation.services import AutomationService
+from automation.tasks import enqueue_sync, get_last_sync_result, run_locked_sync
+from functools import lru_cache
+import hashlib
+import hmac
 import logging
-import json
+import orjson
 
 logger = logging.getLogger('automation')
 
+# Syncs are blocking I/O; run them on worker threads so an ASGI event loop
+# (or Django's per-request loop under WSGI) isn't tied up while they run
+_run_locked_sync = sync_to_async(run_locked_sync, thread_sensitive=False)
+_enqueue_sync = sync_to_async(enqueue_sync, thread_sensitive=False)
+
+# Request values checked on every call, built once
+_VALID_STATES = frozenset({'open', 'closed', 'all'})
+_OPEN_SYNC_ACTIONS = frozenset({'assigned', 'opened', 'edited', 'reopened'})
+
+# GitHub often sends several issue events at once (e.g. opened + assigned);
+# waiting this long before syncing folds the burst into a single run
+WEBHOOK_DEBOUNCE_SECONDS = 2
+
+# The health payload never changes, so serialize it once at import
+_HEALTH_BYTES = orjson.dumps({
+    'status': 'healthy',
+    'service': 'GitHub-Notion Automation',
+    'version': '1.0.0'
+})
+
+def _ojson(data, status=200):
+    """JSON response encoded with orjson (handles datetimes without DjangoJSONEncoder)"""
+    return HttpResponse(
+        orjson.dumps(data, default=str, option=orjson.OPT_NAIVE_UTC),
+        content_type='application/json',
+        status=status
+    )
+
+@lru_cache(maxsize=1)
+def _status_payload():
+    """Configuration summary for sync_status; settings are fixed for the process lifetime"""
+    return {
+        'github_configured': bool(settings.GITHUB_TOKEN),
+        'notion_configured': bool(settings.NOTION_TOKEN),
+        'gemini_configured': bool(settings.GEMINI_API_KEY),
+        'database_id': settings.NOTION_DATABASE_ID,
+        'username': settings.GITHUB_USERNAME
+    }
+
+def _valid_signature(request) -> bool:
+    """Check X-Hub-Signature-256 against GITHUB_WEBHOOK_SECRET (always valid when no secret is set)"""
+    secret = getattr(settings, 'GITHUB_WEBHOOK_SECRET', None)
+    if not secret:
+        return True
+    
+    signature = request.headers.get('X-Hub-Signature-256', '')
+    expected = 'sha256=' + hmac.new(secret.encode(), request.body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(signature, expected)
+
+def _already_running(state):
+    """202 response for a sync request that was coalesced into one already in progress"""
+    return _ojson({
+        'success': True,
+        'message': 'sync already running',
+        'deduplicated': True,
+        'last_result': get_last_sync_result(state)
+    }, status=202)
+
+def _no_sync_needed(action):
+    """Response for a webhook action that doesn't affect synced issues"""
+    return _ojson({'success': True, 'message': f'No sync needed for action: {action}'})
+
+def _error_response(error, **extra):
+    """500 response reporting a failed request"""
+    return _ojson({'success': False, 'error': str(error), **extra}, status=500)
+
 def health_check(request):
     """Health check endpoint for Render"""
-    return JsonResponse({
-        'status': 'healthy',
-        'service': 'GitHub-Notion Automation',
-        'version': '1.0.0'
-    })
+    return HttpResponse(_HEALTH_BYTES, content_type='application/json')
 
 @csrf_exempt
 @require_http_methods(["POST"])
-def manual_sync(request):
+async def manual_sync(request):
     """Manual sync trigger endpoint"""
     try:
         # Get state parameter from request, default to 'open'
         state = request.POST.get('state', 'open')
-        if state not in ['open', 'closed', 'all']:
+        if state not in _VALID_STATES:
             state = 'open'
             
-        automation_service = AutomationService()
-        result = automation_service.sync_assigned_issues('manual_web', state)
+        result = await _run_locked_sync('manual_web', state)
+        if result is None:
+            return _already_running(state)
         
-        return JsonResponse({
+        return _ojson({
             'success': True,
             'message': 'Sync completed successfully',
             'issues_processed': result.issues_processed,
@@ -39,24 +107,22 @@ def manual_sync(request):
         
     except Exception as e:
         logger.error(f"Manual sync failed: {e}")
-        return JsonResponse({
-            'success': False,
-            'error': str(e)
-        }, status=500)
+        return _error_response(e)
 
 @require_http_methods(["GET"])
-def sync_issues_get(request):
+async def sync_issues_get(request):
     """GET endpoint to sync GitHub issues to Notion"""
     try:
         # Get state parameter from query string, default to 'open'
         state = request.GET.get('state', 'open')
-        if state not in ['open', 'closed', 'all']:
+        if state not in _VALID_STATES:
             state = 'open'
             
-        automation_service = AutomationService()
-        result = automation_service.sync_assigned_issues('manual_get', state)
+        result = await _run_locked_sync('manual_get', state)
+        if result is None:
+            return _already_running(state)
         
-        return JsonResponse({
+        return _ojson({
             'success': True,
             'message': f'GitHub {state} issues synced to Notion successfully',
             'issues_processed': result.issues_processed,
@@ -69,64 +135,59 @@ def sync_issues_get(request):
         
     except Exception as e:
         logger.error(f"GET sync failed: {e}")
-        return JsonResponse({
-            'success': False,
-            'error': str(e),
-            'message': 'Failed to sync GitHub issues to Notion'
-        }, status=500)
+        return _error_response(e, message='Failed to sync GitHub issues to Notion')
 
 @csrf_exempt 
 @require_http_methods(["POST"])
-def webhook_sync(request):
+async def webhook_sync(request):
     """GitHub webhook endpoint for automatic sync"""
     try:
-        # Parse GitHub webhook payload
-        payload = json.loads(request.body)
+        # Only issue events can require a sync, so drop everything else unparsed
+        event = request.headers.get('X-GitHub-Event')
+        if event is not None and event != 'issues':
+            return HttpResponse(status=204)
+        
+        if not _valid_signature(request):
+            logger.warning("Rejected webhook delivery with an invalid signature")
+            return _ojson({
+                'success': False,
+                'error': 'Invalid signature'
+            }, status=401)
+        
+        # Parse GitHub webhook payload (only after the signature check passed)
+        payload = orjson.loads(request.body)
         action = payload.get('action', '')
         
         # Only sync on issue assignment/update events
-        if action in ['assigned', 'opened', 'edited', 'reopened']:
+        if action in _OPEN_SYNC_ACTIONS:
             # For most actions, only sync open issues
-            automation_service = AutomationService()
-            result = automation_service.sync_assigned_issues('webhook', 'open')
+            state = 'open'
         elif action == 'closed':
             # For closed action, sync all issues to update status
-            automation_service = AutomationService()
-            result = automation_service.sync_assigned_issues('webhook', 'all')
+            state = 'all'
         else:
-            return JsonResponse({
-                'success': True,
-                'message': f'No sync needed for action: {action}'
-            })
-            
-        return JsonResponse({
+            return _no_sync_needed(action)
+        
+        # Run the sync in the background so the webhook delivery returns promptly
+        queued = await _enqueue_sync('webhook', state, countdown=WEBHOOK_DEBOUNCE_SECONDS)
+        
+        return _ojson({
             'success': True,
-            'message': f'Webhook sync completed for action: {action}',
-            'issues_processed': result.issues_processed,
-            'issues_synced': result.issues_synced
-        })
+            'accepted': True,
+            'message': f'Webhook sync {"queued" if queued else "already running"} for action: {action}',
+            'queued': queued
+        }, status=202)
             
     except Exception as e:
         logger.error(f"Webhook sync failed: {e}")
-        return JsonResponse({
-            'success': False,
-            'error': str(e)
-        }, status=500)
+        return _error_response(e)
 
 def sync_status(request):
     """Get sync status and basic info"""
     try:
-        from django.conf import settings
-        
-        return JsonResponse({
-            'github_configured': bool(settings.GITHUB_TOKEN),
-            'notion_configured': bool(settings.NOTION_TOKEN),
-            'gemini_configured': bool(settings.GEMINI_API_KEY),
-            'database_id': settings.NOTION_DATABASE_ID,
-            'username': settings.GITHUB_USERNAME
-        })
+        return _ojson(_status_payload())
         
     except Exception as e:
-        return JsonResponse({
+        return _ojson({
             'error': str(e)
         }, status=500)
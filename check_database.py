@@ -13,21 +13,33 @@ sys.path.insert(0, str(project_dir))
 
 # Configure Django settings
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'notion_github_automation.settings')
-import django
-django.setup()
 
-from notion_client import Client
-from django.conf import settings
+def _setup_django():
+    """Set up Django on first use, so importing this script stays cheap"""
+    import django
+    django.setup()
+
+# Schemas rarely change; reuse them across runs for an hour
+SCHEMA_CACHE_TIMEOUT = 3600
 
 def check_database_properties():
     """Check what properties exist in the Notion database"""
+    _setup_django()
+    from notion_client import Client
+    from django.conf import settings
+    from django.core.cache import cache
+    
     print("🔍 Checking Notion database properties...")
     
     try:
         client = Client(auth=settings.NOTION_TOKEN)
         database_id = settings.NOTION_DATABASE_ID
         
-        database_info = client.databases.retrieve(database_id=database_id)
+        database_info = cache.get_or_set(
+            f'notion:schema:{database_id}',
+            lambda: client.databases.retrieve(database_id=database_id),
+            SCHEMA_CACHE_TIMEOUT
+        )
         properties = database_info.get('properties', {})
         
         print(f"✅ Database: {database_info.get('title', [{}])[0].get('plain_text', 'Unnamed')}")
@@ -5,6 +5,7 @@ Clean up duplicate entries and fix repository URLs
 
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Add the project directory to Python path
@@ -13,25 +14,71 @@ sys.path.insert(0, str(project_dir))
 
 # Configure Django settings
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'notion_github_automation.settings')
-import django
-django.setup()
 
-from notion_client import Client
-from django.conf import settings
+def _setup_django():
+    """Set up Django on first use, so importing this script stays cheap"""
+    import django
+    django.setup()
+
+# Concurrent archive calls; Notion rate-limits each integration to ~3 req/s, and
+# NotionService._request paces them and retries 429s on top
+ARCHIVE_WORKERS = 3
+
+def query_all_pages(client, database_id, **query):
+    """Collect every page of a database query, following has_more/next_cursor"""
+    from notion_integration.services import NotionService
+    
+    pages = []
+    cursor = None
+    
+    while True:
+        if cursor:
+            query['start_cursor'] = cursor
+        response = NotionService._request(
+            client.databases.query, database_id=database_id, page_size=100, **query
+        )
+        pages.extend(response.get('results', []))
+        
+        if not response.get('has_more'):
+            return pages
+        cursor = response.get('next_cursor')
+
+def archive_page(client, page):
+    """Archive one page, returning an error message on failure"""
+    from notion_integration.services import NotionService
+    
+    try:
+        NotionService._request(
+            client.pages.update,
+            page_id=page['page_id'],
+            archived=True
+        )
+        return None
+    except Exception as e:
+        return str(e)
 
 def clean_duplicate_entries():
     """Clean up duplicate entries and fix repository URLs"""
+    _setup_django()
+    from django.conf import settings
+    from notion_integration.services import NotionService
+    
     print("🧹 Cleaning up duplicate entries and fixing repository URLs...")
     
     try:
-        client = Client(auth=settings.NOTION_TOKEN)
+        client = NotionService._shared_client(settings.NOTION_TOKEN)
         database_id = settings.NOTION_DATABASE_ID
         
-        # Get all pages from the database
-        response = client.databases.query(database_id=database_id)
-        pages = response.get('results', [])
+        # Let Notion select the issue entries (those with "Issue #" in the title) and
+        # return only the title column; "title" is the fixed ID of a title property
+        pages = query_all_pages(
+            client,
+            database_id,
+            filter={'property': 'Repository', 'title': {'contains': 'Issue #'}},
+            filter_properties=['title']
+        )
         
-        print(f"📊 Found {len(pages)} total pages in database")
+        print(f"📊 Found {len(pages)} matching pages in database")
         
         # Group pages by repository name to find duplicates
         repo_groups = {}
@@ -56,9 +103,8 @@ def clean_duplicate_entries():
         print(f"🔍 Found {len(issue_pages)} issue-related pages")
         
         if issue_pages:
-            print("\nIssue pages found:")
-            for i, page in enumerate(issue_pages, 1):
-                print(f"   {i}. {page['title']}")
+            listing = [f"   {i}. {page['title']}" for i, page in enumerate(issue_pages, 1)]
+            sys.stdout.write("\nIssue pages found:\n" + '\n'.join(listing) + '\n')
             
             # Ask user what to do
             print(f"\n🤔 Would you like to:")
@@ -70,15 +116,15 @@ def clean_duplicate_entries():
             
             if choice == '1':
                 print(f"\n🗑️ Deleting {len(issue_pages)} issue pages...")
-                for page in issue_pages:
-                    try:
-                        client.pages.update(
-                            page_id=page['page_id'],
-                            archived=True
-                        )
-                        print(f"   ✅ Archived: {page['title']}")
-                    except Exception as e:
-                        print(f"   ❌ Failed to archive {page['title']}: {e}")
+                # One client (and its connection pool) is shared by the worker threads
+                with ThreadPoolExecutor(max_workers=ARCHIVE_WORKERS) as executor:
+                    errors = executor.map(lambda page: archive_page(client, page), issue_pages)
+                    results = [
+                        f"   ✅ Archived: {page['title']}" if error is None
+                        else f"   ❌ Failed to archive {page['title']}: {error}"
+                        for page, error in zip(issue_pages, errors)
+                    ]
+                sys.stdout.write('\n'.join(results) + '\n')
                 
                 print(f"\n✅ Cleanup complete! Now run the sync to create correct entries:")
                 print("python manage.py sync_github_issues")
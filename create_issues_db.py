@@ -13,14 +13,18 @@ sys.path.insert(0, str(project_dir))
 
 # Configure Django settings
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'notion_github_automation.settings')
-import django
-django.setup()
 
-from notion_client import Client
-from django.conf import settings
+def _setup_django():
+    """Set up Django on first use, so importing this script stays cheap"""
+    import django
+    django.setup()
 
 def create_issues_database():
     """Create a new database specifically for GitHub issues"""
+    _setup_django()
+    from notion_client import Client
+    from django.conf import settings
+    
     print("🔧 Creating new GitHub Issues database...")
     
     try:
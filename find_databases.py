@@ -13,14 +13,25 @@ sys.path.insert(0, str(project_dir))
 
 # Configure Django settings
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'notion_github_automation.settings')
-import django
-django.setup()
 
-from notion_client import Client
-from django.conf import settings
+def _setup_django():
+    """Set up Django on first use, so importing this script stays cheap"""
+    import django
+    django.setup()
+
+# Schemas rarely change; reuse them across runs for an hour
+SCHEMA_CACHE_TIMEOUT = 3600
+
+# Property names suggesting a database holds GitHub issues
+ISSUE_INDICATORS = frozenset({'Issue ID', 'GitHub URL', 'Assignee', 'Issue', 'Title'})
 
 def find_all_databases():
     """Find all accessible Notion databases"""
+    _setup_django()
+    from notion_client import Client
+    from django.conf import settings
+    from django.core.cache import cache
+    
     print("🔍 Finding all accessible Notion databases...")
     
     try:
@@ -40,8 +51,10 @@ def find_all_databases():
             print("❌ No databases found. Make sure to share databases with your integration.")
             return
         
-        print(f"✅ Found {len(databases)} database(s):")
-        print()
+        # Build the whole listing and write it in one go
+        out = [f"✅ Found {len(databases)} database(s):", ""]
+        
+        current_db_id = settings.NOTION_DATABASE_ID.replace('-', '')
         
         for i, db in enumerate(databases, 1):
             db_id = db.get('id', 'Unknown')
@@ -52,38 +65,44 @@ def find_all_databases():
             if title_property and len(title_property) > 0:
                 db_title = title_property[0].get('plain_text', 'Unnamed')
             
-            print(f"{i}. {db_title}")
-            print(f"   ID: {db_id}")
+            out.append(f"{i}. {db_title}")
+            out.append(f"   ID: {db_id}")
             
             # Check if this is the current database
-            current_db_id = settings.NOTION_DATABASE_ID.replace('-', '')
             if db_id.replace('-', '') == current_db_id:
-                print("   ⭐ CURRENTLY USED")
+                out.append("   ⭐ CURRENTLY USED")
             
-            # Get database properties to understand structure
+            # Get database properties to understand structure; search results
+            # already carry the schema, so only retrieve when it's missing
             try:
-                db_details = client.databases.retrieve(database_id=db_id)
-                properties = db_details.get('properties', {})
-                prop_names = list(properties.keys())
-                print(f"   Properties: {', '.join(prop_names[:5])}")
+                properties = db.get('properties')
+                if properties is None:
+                    db_details = cache.get_or_set(
+                        f'notion:schema:{db_id}',
+                        lambda: client.databases.retrieve(database_id=db_id),
+                        SCHEMA_CACHE_TIMEOUT
+                    )
+                    properties = db_details.get('properties', {})
+                prop_names = list(properties)
+                out.append(f"   Properties: {', '.join(prop_names[:5])}")
                 if len(prop_names) > 5:
-                    print(f"               ...and {len(prop_names) - 5} more")
+                    out.append(f"               ...and {len(prop_names) - 5} more")
                 
                 # Check if this looks like an issues database
-                issue_indicators = ['Issue ID', 'GitHub URL', 'Assignee', 'Issue', 'Title']
-                if any(indicator in prop_names for indicator in issue_indicators):
-                    print("   🎯 LOOKS LIKE ISSUES DATABASE")
+                if not ISSUE_INDICATORS.isdisjoint(properties):
+                    out.append("   🎯 LOOKS LIKE ISSUES DATABASE")
                 
             except Exception as e:
-                print(f"   ⚠️ Could not read properties: {e}")
+                out.append(f"   ⚠️ Could not read properties: {e}")
             
-            print()
+            out.append("")
         
-        print("="*60)
-        print("📋 To switch to the correct database:")
-        print("1. Choose the database ID for 'My Assigned Issue'")
-        print("2. Update your .env file with the correct NOTION_DATABASE_ID")
-        print("3. Make sure the database has the right properties for issues")
+        out.append("="*60)
+        out.append("📋 To switch to the correct database:")
+        out.append("1. Choose the database ID for 'My Assigned Issue'")
+        out.append("2. Update your .env file with the correct NOTION_DATABASE_ID")
+        out.append("3. Make sure the database has the right properties for issues")
+        sys.stdout.write('\n'.join(out) + '\n')
         
     except Exception as e:
         print(f"❌ Error finding databases: {e}")
@@ -1,16 +1,46 @@
+import hashlib
+import orjson
 import requests
 import logging
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Dict, Optional
+from functools import lru_cache
+from urllib.parse import parse_qs, urlencode, urlsplit
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Any, Iterator, List, Dict, Optional, Tuple
 from django.conf import settings
+from django.core.cache import cache
+from notion_github_automation.singletons import process_singleton
 
 
 logger = logging.getLogger('github_integration')
 
+# Held while a thread sleeps out a rate-limit window, so every other request
+# in the process waits too instead of hammering GitHub
+_rate_limit_lock = threading.Lock()
+
 
 class GitHubService:
     """Service class for GitHub API interactions"""
     
+    # (connect, read) timeout in seconds for every GitHub request
+    REQUEST_TIMEOUT = (5, 30)
+    
+    # Retries of a request rejected by a primary or secondary rate limit
+    MAX_RATE_LIMIT_RETRIES = 5
+    
+    # Longest rate-limit window worth sleeping through; every request in the
+    # process waits with it, so longer windows fail the request instead
+    MAX_RATE_LIMIT_WAIT = 60
+    
+    # Pages fetched in parallel once the page count is known; kept small per
+    # GitHub's advice to avoid concurrent bursts (secondary rate limits)
+    PAGE_FETCH_CONCURRENCY = 4
+    
     def __init__(self):
         self.token = settings.GITHUB_TOKEN
         self.username = settings.GITHUB_USERNAME
@@ -25,17 +55,197 @@ class GitHubService:
             raise ValueError("GITHUB_TOKEN is required in environment variables")
         if not self.username:
             raise ValueError("GITHUB_USERNAME is required in environment variables")
+        
+        # Reuse TCP/TLS connections across every request this service makes
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=16,
+            max_retries=Retry(
+                total=5,
+                backoff_factor=1,
+                status_forcelist=[502, 503, 504],  # 403/429 rate limits are handled in _get
+                respect_retry_after_header=True
+            )
+        )
+        self.session.mount("https://", adapter)
     
-    def _make_request(self, url: str, params: Optional[Dict] = None) -> Dict:
-        """Make authenticated request to GitHub API"""
+    def close(self) -> None:
+        """Release the pooled connections held by the session"""
+        session = getattr(self, 'session', None)
+        if session is not None:
+            session.close()
+    
+    def __del__(self):
+        self.close()
+    
+    def _get(self, url: str, params: Optional[Dict] = None, headers: Optional[Dict] = None) -> requests.Response:
+        """Make authenticated request to GitHub API and return the raw response"""
         try:
-            response = requests.get(url, headers=self.headers, params=params)
+            for attempt in range(self.MAX_RATE_LIMIT_RETRIES + 1):
+                # Wait out any rate-limit window another thread is sleeping through
+                with _rate_limit_lock:
+                    pass
+                
+                response = self.session.get(url, headers=headers, params=params, timeout=self.REQUEST_TIMEOUT)
+                
+                wait = self._rate_limit_wait(response, attempt)
+                if wait is None or attempt == self.MAX_RATE_LIMIT_RETRIES:
+                    break
+                if wait > self.MAX_RATE_LIMIT_WAIT:
+                    logger.error(f"GitHub rate limit resets in {wait:.0f}s, not waiting that long")
+                    break
+                
+                logger.warning(f"GitHub rate limit hit, waiting {wait:.0f}s before retrying")
+                with _rate_limit_lock:
+                    time.sleep(wait)
+            
             response.raise_for_status()
-            return response.json()
+            return response
         except requests.exceptions.RequestException as e:
             logger.error(f"GitHub API request failed: {e}")
             raise
     
+    def _rate_limit_wait(self, response: requests.Response, attempt: int) -> Optional[float]:
+        """
+        Work out how long to wait before retrying a rate-limited response
+        
+        Args:
+            response: Response to inspect
+            attempt: Zero-based retry attempt, used for exponential backoff
+        
+        Returns:
+            Seconds to wait, or None if the response was not rate limited
+        """
+        if response.status_code not in (403, 429):
+            return None
+        
+        headers = response.headers
+        retry_after = headers.get('Retry-After')
+        if retry_after is not None:
+            try:
+                return max(0.0, float(retry_after))
+            except ValueError:
+                pass
+        
+        if headers.get('X-RateLimit-Remaining') == '0':
+            try:
+                return max(0.0, int(headers['X-RateLimit-Reset']) - time.time())
+            except (KeyError, ValueError):
+                pass
+        elif response.status_code == 403:
+            # A plain 403 is a permissions error, not a rate limit
+            return None
+        
+        return float(2 ** attempt)
+    
+    def _fetch(self, url: str, params: Optional[Dict] = None) -> Tuple[Any, Dict]:
+        """
+        Make a conditional request, reusing the cached body when nothing changed
+        
+        The last ETag for each URL is kept in the Django cache and sent as
+        If-None-Match; GitHub then answers 304 with no body, which does not
+        count against the rate limit.
+        
+        Args:
+            url: API URL
+            params: Query parameters
+        
+        Returns:
+            Tuple of (parsed JSON body, Link header relations)
+        """
+        request_id = f"{url}?{urlencode(sorted((params or {}).items()))}"
+        cache_key = f"github:etag:{hashlib.sha1(request_id.encode()).hexdigest()}"
+        
+        try:
+            cached = cache.get(cache_key)
+        except Exception as e:
+            logger.debug(f"GitHub response cache lookup failed: {e}")
+            cached = None
+        
+        headers = {"If-None-Match": cached['etag']} if cached else None
+        response = self._get(url, params, headers)
+        
+        if response.status_code == 304 and cached:
+            logger.debug(f"GitHub returned 304 Not Modified for {response.url}")
+            return cached['body'], cached['links']
+        
+        data = orjson.loads(response.content)
+        etag = response.headers.get('ETag')
+        
+        if etag:
+            try:
+                cache.set(
+                    cache_key,
+                    {'etag': etag, 'body': data, 'links': response.links},
+                    getattr(settings, 'GITHUB_ETAG_CACHE_TIMEOUT', 300)
+                )
+            except Exception as e:
+                logger.debug(f"GitHub response cache store failed: {e}")
+        
+        return data, response.links
+    
+    def _make_request(self, url: str, params: Optional[Dict] = None) -> Dict:
+        """Make authenticated request to GitHub API"""
+        return self._fetch(url, params)[0]
+    
+    def _last_page(self, links: Dict) -> Optional[int]:
+        """
+        Read the last page number from a paginated response's Link header
+        
+        Args:
+            links: Link header relations of any page of a paginated listing
+        
+        Returns:
+            Last page number, or None if there is no rel="last" link
+        """
+        last_url = links.get('last', {}).get('url')
+        if not last_url:
+            return None
+        
+        try:
+            return int(parse_qs(urlsplit(last_url).query)['page'][0])
+        except (KeyError, IndexError, ValueError):
+            return None
+    
+    def _iter_pages(self, url: str, params: Dict) -> Iterator[List[Dict]]:
+        """
+        Yield every page of a paginated listing in order
+        
+        Page 1 is fetched first; if its Link header names the last page, the
+        remaining pages are fetched concurrently. Otherwise rel="next" links
+        are followed one page at a time.
+        
+        Args:
+            url: API URL of the listing
+            params: Query parameters, without "page"
+        
+        Yields:
+            List of items on each page
+        """
+        first_page, links = self._fetch(url, {**params, "page": 1})
+        yield first_page
+        
+        last_page = self._last_page(links)
+        if last_page:
+            with ThreadPoolExecutor(max_workers=self.PAGE_FETCH_CONCURRENCY) as executor:
+                yield from executor.map(
+                    lambda page: self._make_request(url, {**params, "page": page}),
+                    range(2, last_page + 1)
+                )
+            return
+        
+        page = 1
+        while 'next' in links:
+            page += 1
+            page_data, links = self._fetch(url, {**params, "page": page})
+            
+            if not page_data:
+                break
+            
+            yield page_data
+    
     def get_assigned_issues(self, state: str = "open", per_page: int = 100) -> List[Dict]:
         """
         Fetch all issues assigned to the authenticated user
@@ -50,32 +260,18 @@ class GitHubService:
         logger.info(f"Fetching assigned issues for user: {self.username}")
         
         all_issues = []
-        page = 1
+        params = {
+            "assignee": self.username,
+            "state": state,
+            "per_page": per_page,
+            "sort": "updated",
+            "direction": "desc"
+        }
         
-        while True:
-            params = {
-                "assignee": self.username,
-                "state": state,
-                "per_page": per_page,
-                "page": page,
-                "sort": "updated",
-                "direction": "desc"
-            }
-            
-            url = f"{self.base_url}/issues"
-            issues_data = self._make_request(url, params)
-            
-            if not issues_data:
-                break
-            
+        url = f"{self.base_url}/issues"
+        for page, issues_data in enumerate(self._iter_pages(url, params), 1):
             all_issues.extend(issues_data)
             logger.info(f"Fetched page {page} with {len(issues_data)} issues")
-            
-            # If we got less than per_page items, we're done
-            if len(issues_data) < per_page:
-                break
-            
-            page += 1
         
         logger.info(f"Total assigned issues fetched: {len(all_issues)}")
         return all_issues
@@ -124,55 +320,49 @@ class GitHubService:
         Returns:
             Parsed issue dictionary
         """
-        # Extract repository information from the URL
-        repo_url = issue_data.get('repository_url', '')
-        repo_parts = repo_url.split('/')
-        repo_owner = repo_parts[-2] if len(repo_parts) >= 2 else ''
-        repo_name = repo_parts[-1] if len(repo_parts) >= 1 else ''
+        get = issue_data.get
+        parse_date = self._parse_github_date
         
-        # Parse dates
-        created_at = self._parse_github_date(issue_data.get('created_at'))
-        updated_at = self._parse_github_date(issue_data.get('updated_at'))
-        closed_at = self._parse_github_date(issue_data.get('closed_at'))
+        # Extract repository information from the URL (.../repos/{owner}/{name})
+        repo_parts = get('repository_url', '').rsplit('/', 2)
+        repo_owner = repo_parts[-2] if len(repo_parts) >= 2 else ''
+        repo_name = repo_parts[-1]
         
         # Extract assignee information
-        assignee = issue_data.get('assignee', {})
+        assignee = get('assignee')
         assignee_login = assignee.get('login', '') if assignee else ''
         
-        # Extract labels
-        labels = [
-            {
-                'name': label.get('name', ''),
-                'color': label.get('color', ''),
-                'description': label.get('description', '')
-            }
-            for label in issue_data.get('labels', [])
-        ]
+        # Only label names are ever used; intern them since the same few repeat across issues
+        labels = tuple(sys.intern(label.get('name') or '') for label in get('labels', ()))
         
         return {
-            'github_id': issue_data.get('id'),
-            'number': issue_data.get('number'),
-            'title': issue_data.get('title', ''),
-            'body': issue_data.get('body', ''),
-            'state': issue_data.get('state', 'open'),
+            'github_id': get('id'),
+            'number': get('number'),
+            'title': get('title', ''),
+            'body': get('body', ''),
+            'state': get('state', 'open'),
             'assignee_login': assignee_login,
             'repository_name': repo_name,
             'repository_owner': repo_owner,
-            'html_url': issue_data.get('html_url', ''),
-            'created_at': created_at,
-            'updated_at': updated_at,
-            'closed_at': closed_at,
+            'html_url': get('html_url', ''),
+            'created_at': parse_date(get('created_at')),
+            'updated_at': parse_date(get('updated_at')),
+            'closed_at': parse_date(get('closed_at')),
             'labels': labels,
         }
     
-    def _parse_github_date(self, date_string: Optional[str]) -> Optional[datetime]:
-        """Parse GitHub ISO date string to datetime object"""
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _parse_github_date(date_string: Optional[str]) -> Optional[datetime]:
+        """Parse GitHub ISO date string to datetime object (memoized; timestamps repeat across syncs)"""
         if not date_string:
             return None
         
         try:
             # GitHub returns dates in ISO format like: 2024-01-01T12:00:00Z
-            return datetime.fromisoformat(date_string.replace('Z', '+00:00'))
+            if date_string.endswith('Z'):
+                date_string = date_string[:-1] + '+00:00'
+            return datetime.fromisoformat(date_string)
         except (ValueError, AttributeError) as e:
             logger.warning(f"Failed to parse date '{date_string}': {e}")
             return None
@@ -181,3 +371,9 @@ class GitHubService:
         """Check GitHub API rate limit status"""
         url = f"{self.base_url}/rate_limit"
         return self._make_request(url)
+
+
+@process_singleton
+def get_github_service() -> GitHubService:
+    """Return the process-wide GitHubService, so the pooled session is set up once per worker"""
+    return GitHubService()
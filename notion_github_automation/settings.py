@@ -142,9 +142,24 @@ STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Cache Configuration
+# File-based by default so cached API results survive between management
+# command runs; set CACHE_BACKEND/CACHE_LOCATION to use Redis or memcached
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('CACHE_BACKEND', 'django.core.cache.backends.filebased.FileBasedCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', str(BASE_DIR / '.cache')),
+        'OPTIONS': {
+            'MAX_ENTRIES': int(os.getenv('CACHE_MAX_ENTRIES', '20000')),  # Several entries per synced issue
+        },
+    }
+}
+
 # GitHub API Configuration
 GITHUB_TOKEN = os.getenv('GITHUB_TOKEN')
 GITHUB_USERNAME = os.getenv('GITHUB_USERNAME')
+GITHUB_WEBHOOK_SECRET = os.getenv('GITHUB_WEBHOOK_SECRET')  # Verifies X-Hub-Signature-256 when set
+GITHUB_ETAG_CACHE_TIMEOUT = int(os.getenv('GITHUB_ETAG_CACHE_TIMEOUT', '300'))  # Matches the webhook/sync cadence
 
 # Notion API Configuration
 NOTION_TOKEN = os.getenv('NOTION_TOKEN')
@@ -152,6 +167,12 @@ NOTION_DATABASE_ID = os.getenv('NOTION_DATABASE_ID')
 
 # Gemini AI Configuration
 GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
+GEMINI_CACHE_TIMEOUT = int(os.getenv('GEMINI_CACHE_TIMEOUT', '604800'))  # Cached AI descriptions live for a week
+GEMINI_BATCH_PROMPTS = os.getenv('GEMINI_BATCH_PROMPTS', 'True').lower() == 'true'  # One prompt per 20 issues
+
+# Sync Configuration
+SYNC_CONCURRENCY = int(os.getenv('SYNC_CONCURRENCY', '16'))  # Issues processed in parallel
+SYNC_MIRROR_PATH = os.getenv('SYNC_MIRROR_PATH', str(BASE_DIR / 'sync_mirror.sqlite3'))  # Local record of synced pages
 
 # Logging Configuration
 LOGGING = {
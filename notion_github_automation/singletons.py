@@ -0,0 +1,32 @@
+import functools
+import threading
+from typing import Callable, TypeVar
+
+
+T = TypeVar('T')
+
+
+def process_singleton(factory: Callable[[], T]) -> Callable[[], T]:
+    """
+    Turn a zero-argument factory into a getter for one shared instance per process
+    
+    functools.cache alone may run the factory twice when threads race on the
+    first call, so that call is serialised by a lock; once the instance exists
+    the outer cache returns it without locking.
+    
+    Args:
+        factory: Function building the instance
+    
+    Returns:
+        Getter returning the shared instance, creating it on first use
+    """
+    lock = threading.Lock()
+    create = functools.cache(factory)
+    
+    @functools.wraps(factory)
+    @functools.cache
+    def getter() -> T:
+        with lock:
+            return create()
+    
+    return getter
@@ -0,0 +1,111 @@
+import logging
+import sqlite3
+import threading
+from typing import Dict, Iterable, NamedTuple, Optional, Tuple
+from django.conf import settings
+from notion_github_automation.singletons import process_singleton
+
+
+logger = logging.getLogger('notion_integration')
+
+
+class SyncedPage(NamedTuple):
+    """What was last written to Notion for one GitHub issue"""
+    page_id: str
+    updated_at: str
+    body_hash: bytes
+
+
+class SyncedPageStore:
+    """
+    Local SQLite mirror of synced issues, one row per GitHub issue
+    
+    Lets a sync decide create/update/skip without asking Notion whether a page
+    exists or has changed.
+    """
+    
+    # Stay well under SQLite's bound-parameter limit in IN (...) lookups
+    LOOKUP_BATCH_SIZE = 500
+    
+    def __init__(self, path: str):
+        self.path = path
+        
+        # Sync workers share one connection; the lock serialises access to it
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS synced_pages ("
+                "github_id INTEGER PRIMARY KEY, page_id TEXT NOT NULL, "
+                "updated_at TEXT NOT NULL, body_hash BLOB NOT NULL)"
+            )
+    
+    def get(self, github_id: int) -> Optional[SyncedPage]:
+        """
+        Look up the mirrored row for one issue
+        
+        Args:
+            github_id: GitHub issue ID
+        
+        Returns:
+            SyncedPage, or None if the issue has never been synced
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT page_id, updated_at, body_hash FROM synced_pages WHERE github_id = ?",
+                (github_id,)
+            ).fetchone()
+        return SyncedPage(*row) if row else None
+    
+    def get_many(self, github_ids: Iterable[int]) -> Dict[int, SyncedPage]:
+        """
+        Look up the mirrored rows for many issues
+        
+        Args:
+            github_ids: GitHub issue IDs
+        
+        Returns:
+            Dictionary mapping GitHub issue ID to SyncedPage, for synced issues only
+        """
+        github_ids = list(github_ids)
+        rows = {}
+        
+        with self._lock:
+            for start in range(0, len(github_ids), self.LOOKUP_BATCH_SIZE):
+                batch = github_ids[start:start + self.LOOKUP_BATCH_SIZE]
+                placeholders = ",".join("?" * len(batch))
+                cursor = self._connection.execute(
+                    "SELECT github_id, page_id, updated_at, body_hash FROM synced_pages "
+                    f"WHERE github_id IN ({placeholders})",
+                    batch
+                )
+                for github_id, page_id, updated_at, body_hash in cursor:
+                    rows[github_id] = SyncedPage(page_id, updated_at, body_hash)
+        
+        return rows
+    
+    def upsert_many(self, rows: Iterable[Tuple[int, str, str, bytes]]) -> None:
+        """
+        Record what was written to Notion, in one transaction
+        
+        Args:
+            rows: (github_id, page_id, updated_at, body_hash) tuples
+        """
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO synced_pages (github_id, page_id, updated_at, body_hash) "
+                "VALUES (?, ?, ?, ?)",
+                rows
+            )
+    
+    def upsert(self, github_id: int, page_id: str, updated_at: str, body_hash: bytes) -> None:
+        """Record what was written to Notion for one issue"""
+        self.upsert_many([(github_id, page_id, updated_at, body_hash)])
+
+
+@process_singleton
+def get_synced_page_store() -> SyncedPageStore:
+    """Return the process-wide SyncedPageStore, opening the SYNC_MIRROR_PATH database on first use"""
+    return SyncedPageStore(settings.SYNC_MIRROR_PATH)
@@ -1,17 +1,154 @@
 import logging
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Optional, Any
-from notion_client import Client
+from functools import lru_cache
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Any, Tuple
+import httpx
+import orjson
+from notion_client import APIResponseError, Client
 from django.conf import settings
-from ai_integration.services import GeminiService
+from ai_integration.services import get_gemini_service
+from notion_github_automation.singletons import process_singleton
 
 
 logger = logging.getLogger('notion_integration')
 
+# Splits an issue body into chunks within Notion's 2000 character text block limit
+_BODY_CHUNK_RE = re.compile(r".{1,2000}", re.S)
+
+# Label keywords mapped to the Notion priority they imply, strongest first
+_PRIORITY_MAP = {'critical': 'Critical', 'urgent': 'Critical', 'high': 'High', 'important': 'High'}
+_PRIORITY_RE = re.compile('|'.join(_PRIORITY_MAP), re.IGNORECASE)
+
+
+@lru_cache(maxsize=1024)
+def _priority_for_labels(labels: Tuple[str, ...]) -> Optional[str]:
+    """
+    Return the priority implied by the first label mentioning a priority keyword
+    
+    Args:
+        labels: Issue label names
+    
+    Returns:
+        "Critical" or "High", or None if no label mentions a priority
+    """
+    for label in labels:
+        keywords = _PRIORITY_RE.findall(label)
+        if keywords:
+            # A label naming both levels (e.g. "high-critical") takes the stronger one
+            priorities = {_PRIORITY_MAP[keyword.lower()] for keyword in keywords}
+            return "Critical" if "Critical" in priorities else "High"
+    return None
+
+
+def _title_property(text: str) -> Dict:
+    """Notion title property value holding plain text"""
+    return {"title": [{"text": {"content": text}}]}
+
+
+def _rich_text_property(text: str) -> Dict:
+    """Notion rich text property value holding plain text"""
+    return {"rich_text": [{"text": {"content": text}}]}
+
+
+def _url_property(url: str) -> Dict:
+    """Notion URL property value"""
+    return {"url": url}
+
+
+def _number_property(number: int) -> Dict:
+    """Notion number property value"""
+    return {"number": number}
+
+
+def _select_property(name: str) -> Dict:
+    """Notion select property value"""
+    return {"select": {"name": name}}
+
+
+class _OrjsonClient(Client):
+    """notion_client Client that encodes request bodies and decodes responses with orjson"""
+    
+    def _build_request(self, method: str, path: str, query: Optional[Dict] = None,
+                       body: Optional[Dict] = None, auth: Optional[str] = None) -> httpx.Request:
+        headers = httpx.Headers()
+        if auth:
+            headers["Authorization"] = f"Bearer {auth}"
+        
+        content = None
+        if body is not None:
+            content = orjson.dumps(body)
+            headers["Content-Type"] = "application/json"
+        
+        return self.client.build_request(method, path, params=query, content=content, headers=headers)
+    
+    def _parse_response(self, response: httpx.Response) -> Any:
+        if response.is_success:
+            return orjson.loads(response.content)
+        # Error bodies are rare; let the SDK map them to its exception types
+        return super()._parse_response(response)
+
+
+class _TTLCache:
+    """Small thread-safe mapping whose entries expire ``ttl`` seconds after being stored"""
+    
+    def __init__(self, ttl: float, maxsize: int = 128):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries: Dict[Any, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+    
+    def get(self, key: Any) -> Optional[Any]:
+        """Return the live value for key, or None if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                return None
+            return entry[1]
+    
+    def set(self, key: Any, value: Any) -> None:
+        """Store value under key, evicting the oldest entry when full"""
+        with self._lock:
+            self._entries.pop(key, None)
+            if len(self._entries) >= self.maxsize:
+                del self._entries[next(iter(self._entries))]
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+
 
 class NotionService:
     """Service class for Notion API interactions"""
     
+    # Notion allows ~3 requests/second per integration, so cap in-flight calls
+    # across every instance and worker thread in the process
+    _request_gate = threading.BoundedSemaphore(3)
+    BULK_WORKERS = 3
+    
+    # Requests are also spaced ~340ms apart process-wide so bursts stay under
+    # the limit; 429 responses are retried after the Retry-After they carry
+    MIN_REQUEST_INTERVAL = 0.34
+    MAX_RATE_LIMIT_RETRIES = 3
+    _pace_lock = threading.Lock()
+    _next_request_at = 0.0
+    
+    # SDK clients shared per token, so every NotionService in the process reuses
+    # one pool of keep-alive connections to api.notion.com. The SDK rewrites the
+    # transport's headers when a Client is built, so Clients are shared too.
+    _clients: Dict[str, Client] = {}
+    _clients_lock = threading.Lock()
+    
+    # Database schemas are effectively static, so retrieve each at most every 5 minutes
+    _database_info_cache = _TTLCache(ttl=300, maxsize=4)
+    
+    # Most child blocks Notion accepts in one pages.create/children.append call
+    MAX_BLOCKS_PER_REQUEST = 100
+    
     def __init__(self):
         self.token = settings.NOTION_TOKEN
         self.database_id = settings.NOTION_DATABASE_ID
@@ -21,34 +158,112 @@ class NotionService:
         if not self.database_id:
             raise ValueError("NOTION_DATABASE_ID is required in environment variables")
         
-        self.client = Client(auth=self.token)
-        self.gemini_service = GeminiService()  # Initialize Gemini AI service
+        self.client = self._shared_client(self.token)
+        self.gemini_service = get_gemini_service()  # Shared Gemini AI service
+        self._url_index: Optional[Dict[str, str]] = None  # Issue URL -> page ID, see prefetch_url_index
+    
+    @classmethod
+    def _shared_client(cls, token: str) -> Client:
+        """
+        Return the process-wide SDK client for a token, creating it on first use
+        
+        Args:
+            token: Notion integration token
+        
+        Returns:
+            notion_client Client backed by a pooled httpx.Client
+        """
+        with cls._clients_lock:
+            client = cls._clients.get(token)
+            if client is None:
+                http_client = httpx.Client(
+                    limits=httpx.Limits(max_keepalive_connections=10, keepalive_expiry=60)
+                )
+                client = cls._clients[token] = _OrjsonClient(auth=token, client=http_client)
+            return client
+    
+    @classmethod
+    def _request(cls, endpoint_method, **kwargs):
+        """
+        Call a notion-client endpoint method behind the shared concurrency gate
+        
+        Pacing and the gate are process-wide, so scripts holding a bare shared
+        client can call this on the class as well.
+        
+        Args:
+            endpoint_method: Bound SDK method (e.g. self.client.pages.create)
+            **kwargs: Arguments forwarded to the SDK method
+        
+        Returns:
+            The SDK response
+        """
+        for attempt in range(cls.MAX_RATE_LIMIT_RETRIES + 1):
+            cls._wait_for_request_slot()
+            try:
+                with cls._request_gate:
+                    return endpoint_method(**kwargs)
+            except APIResponseError as e:
+                if e.status != 429 or attempt == cls.MAX_RATE_LIMIT_RETRIES:
+                    raise
+                delay = cls._retry_after(e)
+                logger.warning(f"Notion rate limit hit, retrying in {delay:.1f}s")
+                cls._defer_requests(delay)
+    
+    @classmethod
+    def _wait_for_request_slot(cls) -> None:
+        """Block until this process may send its next Notion request"""
+        with cls._pace_lock:
+            now = time.monotonic()
+            slot = max(now, cls._next_request_at)
+            cls._next_request_at = slot + cls.MIN_REQUEST_INTERVAL
+        
+        if slot > now:
+            time.sleep(slot - now)
+    
+    @classmethod
+    def _defer_requests(cls, delay: float) -> None:
+        """Hold back every request in the process for delay seconds"""
+        with cls._pace_lock:
+            cls._next_request_at = max(cls._next_request_at, time.monotonic() + delay)
     
-    def create_issue_page(self, issue_data: Dict) -> Optional[str]:
+    @staticmethod
+    def _retry_after(error: APIResponseError) -> float:
+        """Seconds to wait before retrying a rate-limited request"""
+        try:
+            return max(float(error.headers.get('Retry-After', 1)), 0.0)
+        except (TypeError, ValueError):
+            return 1.0
+    
+    def create_issue_page(self, issue_data: Dict, description: Optional[str] = None) -> Optional[str]:
         """
         Create a new page in Notion database for a GitHub issue
         
         Args:
             issue_data: Parsed GitHub issue data
+            description: Pre-generated description (generated with Gemini if omitted)
         
         Returns:
             Notion page ID if successful, None otherwise
         """
         try:
             # Prepare properties for the Notion page
-            properties = self._build_page_properties(issue_data)
+            properties = self._build_page_properties(issue_data, description)
+            blocks = self._iter_content_blocks(issue_data)
             
-            # Create the page
-            response = self.client.pages.create(
+            # Create the page with the issue body inline, saving a separate append call
+            response = self._request(
+                self.client.pages.create,
                 parent={"database_id": self.database_id},
-                properties=properties
+                properties=properties,
+                children=list(islice(blocks, self.MAX_BLOCKS_PER_REQUEST))
             )
             
             page_id = response.get('id')
             logger.info(f"Created Notion page for issue #{issue_data.get('github_id')}: {page_id}")
+            self._remember_page(issue_data, page_id)
             
-            # Add issue content as page content
-            self._add_issue_content(page_id, issue_data)
+            # Only bodies too long for one request need a follow-up append
+            self._add_issue_content(page_id, blocks)
             
             return page_id
             
@@ -56,21 +271,23 @@ class NotionService:
             logger.error(f"Failed to create Notion page for issue #{issue_data.get('github_id')}: {e}")
             return None
     
-    def update_issue_page(self, page_id: str, issue_data: Dict) -> bool:
+    def update_issue_page(self, page_id: str, issue_data: Dict, description: Optional[str] = None) -> bool:
         """
         Update an existing Notion page with new issue data
         
         Args:
             page_id: Notion page ID
             issue_data: Updated GitHub issue data
+            description: Pre-generated description (generated with Gemini if omitted)
         
         Returns:
             True if successful, False otherwise
         """
         try:
-            properties = self._build_page_properties(issue_data)
+            properties = self._build_page_properties(issue_data, description)
             
-            self.client.pages.update(
+            self._request(
+                self.client.pages.update,
                 page_id=page_id,
                 properties=properties
             )
@@ -82,12 +299,65 @@ class NotionService:
             logger.error(f"Failed to update Notion page {page_id}: {e}")
             return False
     
-    def _build_page_properties(self, issue_data: Dict) -> Dict:
+    def upsert_issue(self, issue_data: Dict, description: Optional[str] = None,
+                     page_id: Optional[str] = None) -> Tuple[Optional[str], bool]:
+        """
+        Create or update the Notion page for a GitHub issue
+        
+        Args:
+            issue_data: Parsed GitHub issue data
+            description: Pre-generated description (generated with Gemini if omitted)
+            page_id: Known Notion page ID; looked up by issue URL (prefetched index
+                first) when omitted
+        
+        Returns:
+            Tuple of (page ID, or None if the write failed; whether a page was created)
+        """
+        if page_id is None:
+            page_id = self.find_page_id_by_url(issue_data.get('html_url', ''))
+        
+        if page_id:
+            success = self.update_issue_page(page_id, issue_data, description)
+            return (page_id if success else None), False
+        
+        return self.create_issue_page(issue_data, description), True
+    
+    def bulk_create_issue_pages(self, issues: List[Tuple[Dict, Optional[str]]]) -> List[Optional[str]]:
+        """
+        Create Notion pages for many issues concurrently
+        
+        Requests are paced by _request, so the pool keeps Notion's rate limit
+        saturated without exceeding it.
+        
+        Args:
+            issues: (parsed issue data, pre-generated description) pairs
+        
+        Returns:
+            Notion page IDs aligned with issues (None where creation failed)
+        """
+        with ThreadPoolExecutor(max_workers=self.BULK_WORKERS) as executor:
+            return list(executor.map(lambda issue: self.create_issue_page(*issue), issues))
+    
+    def bulk_update_issue_pages(self, issues: List[Tuple[str, Dict, Optional[str]]]) -> List[bool]:
+        """
+        Update many existing Notion pages concurrently
+        
+        Args:
+            issues: (Notion page ID, parsed issue data, pre-generated description) triples
+        
+        Returns:
+            Success flags aligned with issues
+        """
+        with ThreadPoolExecutor(max_workers=self.BULK_WORKERS) as executor:
+            return list(executor.map(lambda issue: self.update_issue_page(*issue), issues))
+    
+    def _build_page_properties(self, issue_data: Dict, description: Optional[str] = None) -> Dict:
         """
         Build Notion page properties adapted to the user's existing database structure
         
         Args:
             issue_data: Parsed GitHub issue data
+            description: Pre-generated description (generated with Gemini if omitted)
         
         Returns:
             Dictionary of Notion properties
@@ -96,155 +366,216 @@ class NotionService:
         # but adapt them to the available properties
         
         repo_name = f"{issue_data.get('repository_owner')}/{issue_data.get('repository_name')}"
-        issue_title = issue_data.get('title', '')
-        issue_number = issue_data.get('number', 'Unknown')
-        issue_state = issue_data.get('state', 'open')
         assignee = issue_data.get('assignee_login', '')
         
-        # Use just the repository name as the title
-        page_title = repo_name
-        
-        # Use Gemini AI to create an enhanced description
-        enhanced_description = self.gemini_service.enhance_issue_description(issue_data)
+        # Use Gemini AI to create an enhanced description unless one was batched up front
+        if description is not None:
+            enhanced_description = description
+        else:
+            enhanced_description = self.gemini_service.enhance_issue_description(issue_data)
         
         properties = {
-            "Repository": {
-                "title": [
-                    {
-                        "text": {
-                            "content": page_title  # Use repository name as title
-                        }
-                    }
-                ]
-            },
-            "Description": {
-                "rich_text": [
-                    {
-                        "text": {
-                            "content": enhanced_description
-                        }
-                    }
-                ]
-            },
-            "Repository URL": {
-                "url": issue_data.get('html_url', f"https://github.com/{repo_name}")
-            },
-            "Last Activity": {
-                "rich_text": [
-                    {
-                        "text": {
-                            "content": f"Updated: {issue_data.get('updated_at', 'Unknown')}"
-                        }
-                    }
-                ]
-            },
-            "Issues": {
-                "number": 1  # This represents one issue
-            },
-            "Assigned Issues": {
-                "number": 1 if assignee else 0
-            }
+            "Repository": _title_property(repo_name),  # Use just the repository name as the title
+            "Description": _rich_text_property(enhanced_description),
+            "Repository URL": _url_property(issue_data.get('html_url', f"https://github.com/{repo_name}")),
+            "Last Activity": self._last_activity_property(issue_data),
+            "Issues": _number_property(1),  # This represents one issue
+            "Assigned Issues": _number_property(1 if assignee else 0)
         }
         
         # Set priority based on labels if available
-        labels = issue_data.get('labels', [])
-        priority_labels = ['critical', 'high', 'urgent', 'important']
-        
-        for label in labels:
-            label_name = label.get('name', '').lower()
-            if any(priority in label_name for priority in priority_labels):
-                if 'critical' in label_name or 'urgent' in label_name:
-                    priority = "Critical"
-                elif 'high' in label_name or 'important' in label_name:
-                    priority = "High"
-                else:
-                    priority = "Medium"
-                
-                properties["Priority"] = {
-                    "select": {
-                        "name": priority
-                    }
-                }
-                break
+        priority = _priority_for_labels(tuple(issue_data.get('labels', ())))
+        if priority:
+            properties["Priority"] = _select_property(priority)
         
         return properties
     
-    def _add_issue_content(self, page_id: str, issue_data: Dict) -> None:
+    def _last_activity_property(self, issue_data: Dict) -> Dict:
+        """
+        Build the "Last Activity" value for the database's property type
+        
+        A date property lets Notion sort and filter on it server-side; databases
+        that still have the original rich text column get the "Updated: ..." text.
+        
+        Args:
+            issue_data: Parsed GitHub issue data
+        
+        Returns:
+            Notion property value for "Last Activity"
+        """
+        updated_at = issue_data.get('updated_at')
+        
+        if self._property_type("Last Activity") == "date":
+            if isinstance(updated_at, datetime):
+                updated_at = updated_at.isoformat()
+            return {"date": {"start": updated_at} if updated_at else None}
+        
+        return _rich_text_property(f"Updated: {updated_at or 'Unknown'}")
+    
+    def _property_type(self, name: str) -> Optional[str]:
+        """Return the type of a database property, or None if unknown"""
+        try:
+            return self.get_database_info().get('properties', {}).get(name, {}).get('type')
+        except Exception:
+            return None
+    
+    def _property_id(self, name: str) -> Optional[str]:
+        """Return the ID of a database property, or None if unknown"""
+        try:
+            return self.get_database_info().get('properties', {}).get(name, {}).get('id')
+        except Exception:
+            return None
+    
+    def _add_issue_content(self, page_id: str, blocks: Iterator[Dict]) -> None:
         """
-        Add the issue body as content to the Notion page
+        Append issue body blocks to an existing Notion page
+        
+        Blocks are sent in order, at most MAX_BLOCKS_PER_REQUEST per call.
         
         Args:
             page_id: Notion page ID
-            issue_data: GitHub issue data
+            blocks: Paragraph blocks from _iter_content_blocks
         """
         try:
-            body = issue_data.get('body', '')
-            if not body:
-                return
-            
-            # Split body into chunks if it's too long (Notion has limits)
-            max_length = 2000  # Notion text block limit
-            body_chunks = [body[i:i+max_length] for i in range(0, len(body), max_length)]
-            
-            blocks = []
-            for chunk in body_chunks:
-                blocks.append({
-                    "object": "block",
-                    "type": "paragraph",
-                    "paragraph": {
-                        "rich_text": [
-                            {
-                                "type": "text",
-                                "text": {
-                                    "content": chunk
-                                }
-                            }
-                        ]
-                    }
-                })
-            
-            if blocks:
-                self.client.blocks.children.append(
+            while True:
+                batch = list(islice(blocks, self.MAX_BLOCKS_PER_REQUEST))
+                if not batch:
+                    break
+                self._request(
+                    self.client.blocks.children.append,
                     block_id=page_id,
-                    children=blocks
+                    children=batch
                 )
                 
         except Exception as e:
             logger.warning(f"Failed to add content to Notion page {page_id}: {e}")
     
-    def _format_date_for_notion(self, date_obj: Optional[datetime]) -> Optional[str]:
+    def _iter_content_blocks(self, issue_data: Dict) -> Iterator[Dict]:
         """
-        Format datetime object for Notion API
+        Lazily build paragraph blocks holding the issue body
         
         Args:
-            date_obj: Python datetime object
+            issue_data: GitHub issue data
         
         Returns:
-            ISO formatted date string or None
+            Iterator of Notion paragraph blocks (empty if the issue has no body)
         """
-        if not date_obj:
-            return None
+        body = issue_data.get('body') or ''
         
-        try:
-            return date_obj.isoformat()
-        except Exception as e:
-            logger.warning(f"Failed to format date {date_obj}: {e}")
-            return None
+        # Split body into chunks if it's too long (Notion has limits)
+        return (
+            {
+                "object": "block",
+                "type": "paragraph",
+                "paragraph": {
+                    "rich_text": [
+                        {
+                            "type": "text",
+                            "text": {
+                                "content": match.group()
+                            }
+                        }
+                    ]
+                }
+            }
+            for match in _BODY_CHUNK_RE.finditer(body)
+        )
     
-    def get_database_info(self) -> Dict:
+    def get_database_info(self, refresh: bool = False) -> Dict:
         """
         Get information about the Notion database
         
+        Args:
+            refresh: Skip the schema cache and ask Notion, e.g. for connectivity checks
+        
         Returns:
             Database information dictionary
         """
+        if not refresh:
+            cached = self._database_info_cache.get(self.database_id)
+            if cached is not None:
+                return cached
+        
         try:
-            response = self.client.databases.retrieve(database_id=self.database_id)
+            response = self._request(self.client.databases.retrieve, database_id=self.database_id)
+            self._database_info_cache.set(self.database_id, response)
             return response
         except Exception as e:
             logger.error(f"Failed to retrieve database info: {e}")
             raise
     
+    def list_all_issue_pages(self) -> Dict[str, str]:
+        """
+        Page through the whole database and index pages by their Repository URL
+        
+        Returns:
+            Dictionary mapping GitHub issue URL to Notion page ID
+        """
+        url_index = {}
+        start_cursor = None
+        
+        # Only the URL column is read, so don't download every other property
+        url_property_id = self._property_id("Repository URL")
+        
+        while True:
+            query = {"database_id": self.database_id, "page_size": 100}
+            if url_property_id:
+                query["filter_properties"] = [url_property_id]
+            if start_cursor:
+                query["start_cursor"] = start_cursor
+            
+            response = self._request(self.client.databases.query, **query)
+            
+            for page in response.get('results', []):
+                url = page.get('properties', {}).get('Repository URL', {}).get('url')
+                if url:
+                    # Keep the first page per URL, matching search_pages_by_issue_url
+                    url_index.setdefault(url, page['id'])
+            
+            if not response.get('has_more'):
+                break
+            start_cursor = response.get('next_cursor')
+        
+        logger.info(f"Indexed {len(url_index)} existing Notion pages by issue URL")
+        return url_index
+    
+    def prefetch_url_index(self) -> Dict[str, str]:
+        """
+        Load the issue URL -> page ID index used by find_page_id_by_url
+        
+        Call once at the start of a sync; pages created through this service
+        afterwards are added to the index as they are created.
+        
+        Returns:
+            Dictionary mapping GitHub issue URL to Notion page ID
+        """
+        self._url_index = self.list_all_issue_pages()
+        return self._url_index
+    
+    def find_page_id_by_url(self, issue_url: str) -> Optional[str]:
+        """
+        Find the Notion page for a GitHub issue URL
+        
+        Uses the prefetched index when loaded, otherwise searches Notion.
+        
+        Args:
+            issue_url: GitHub issue URL (e.g., https://github.com/owner/repo/issues/1)
+        
+        Returns:
+            Notion page ID, or None if the issue has no page yet
+        """
+        if self._url_index is not None:
+            return self._url_index.get(issue_url)
+        
+        existing_pages = self.search_pages_by_issue_url(issue_url)
+        return existing_pages[0]['id'] if existing_pages else None
+    
+    def _remember_page(self, issue_data: Dict, page_id: Optional[str]) -> None:
+        """Add a newly created page to the prefetched URL index, if one is loaded"""
+        issue_url = issue_data.get('html_url')
+        if self._url_index is not None and page_id and issue_url:
+            self._url_index.setdefault(issue_url, page_id)
+    
     def search_pages_by_issue_url(self, issue_url: str) -> List[Dict]:
         """
         Search for existing Notion pages by exact GitHub issue URL to prevent duplicates
@@ -257,7 +588,8 @@ class NotionService:
         """
         try:
             # Search by exact Repository URL match
-            response = self.client.databases.query(
+            response = self._request(
+                self.client.databases.query,
                 database_id=self.database_id,
                 filter={
                     "property": "Repository URL",
@@ -274,49 +606,6 @@ class NotionService:
         except Exception as e:
             logger.error(f"Failed to search for issue URL {issue_url}: {e}")
             return []
-
-    def search_pages_by_issue_id(self, github_issue_id: int) -> List[Dict]:
-        """
-        Search for existing Notion pages by GitHub URL to prevent duplicates
-        
-        Args:
-            github_issue_id: GitHub issue ID
-        
-        Returns:
-            List of matching Notion pages
-        """
-        try:
-            # First try to search by Repository URL (which contains the issue URL)
-            response = self.client.databases.query(
-                database_id=self.database_id,
-                filter={
-                    "property": "Repository URL",
-                    "url": {
-                        "contains": f"/issues/"
-                    }
-                }
-            )
-            
-            results = response.get('results', [])
-            
-            # Filter results to find exact match for this issue ID
-            matching_pages = []
-            for page in results:
-                properties = page.get('properties', {})
-                repo_url_prop = properties.get('Repository URL', {})
-                
-                if repo_url_prop.get('type') == 'url':
-                    url = repo_url_prop.get('url', '')
-                    # Check if this URL contains our specific issue ID
-                    if f"/issues/{github_issue_id}" in url or f"#{github_issue_id}" in url:
-                        matching_pages.append(page)
-            
-            logger.info(f"Found {len(matching_pages)} existing pages for issue #{github_issue_id}")
-            return matching_pages
-            
-        except Exception as e:
-            logger.error(f"Failed to search for issue #{github_issue_id}: {e}")
-            return []
     
     def create_database_if_not_exists(self, parent_page_id: str) -> str:
         """
@@ -346,10 +635,12 @@ class NotionService:
                 "Labels": {"multi_select": {"options": []}},
                 "Created Date": {"date": {}},
                 "Updated Date": {"date": {}},
-                "Closed Date": {"date": {}}
+                "Closed Date": {"date": {}},
+                "Last Activity": {"date": {}}
             }
             
-            response = self.client.databases.create(
+            response = self._request(
+                self.client.databases.create,
                 parent={"page_id": parent_page_id},
                 title=[
                     {
@@ -369,3 +660,14 @@ class NotionService:
         except Exception as e:
             logger.error(f"Failed to create Notion database: {e}")
             raise
+
+
+@process_singleton
+def get_notion_service() -> NotionService:
+    """
+    Return the process-wide NotionService, creating it on first use
+    
+    For scripts and one-off checks; a sync builds its own instance because
+    it keeps a per-run URL index on it.
+    """
+    return NotionService()
@@ -17,8 +17,8 @@ sys.path.insert(0, str(project_dir))
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'notion_github_automation.settings')
 django.setup()
 
-from github_integration.services import GitHubService
-from notion_integration.services import NotionService
+from github_integration.services import get_github_service
+from notion_integration.services import get_notion_service
 
 
 def check_environment():
@@ -51,7 +51,7 @@ def test_github_connection():
     print("\n🔍 Testing GitHub connection...")
     
     try:
-        github_service = GitHubService()
+        github_service = get_github_service()
         rate_limit = github_service.check_api_rate_limit()
         
         print("✅ GitHub connection successful")
@@ -73,8 +73,8 @@ def test_notion_connection():
     print("\n🔍 Testing Notion connection...")
     
     try:
-        notion_service = NotionService()
-        database_info = notion_service.get_database_info()
+        notion_service = get_notion_service()
+        database_info = notion_service.get_database_info(refresh=True)
         
         print("✅ Notion connection successful")
         print(f"   Database: {database_info.get('title', [{}])[0].get('plain_text', 'Unnamed')}")
@@ -119,7 +119,7 @@ def run_test_sync():
         else:
             print(f"⚠️ Test sync completed with status: {sync_result.status}")
             if sync_result.error_messages:
-                print(f"   Errors: {'; '.join(sync_result.error_messages)}")
+                print(f"   Errors: {sync_result.error_messages.strip().replace(chr(10), '; ')}")
         
         return True
         
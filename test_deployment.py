@@ -77,8 +77,8 @@ def test_deployment_readiness():
         automation_service = AutomationService()
         print("   ✅ Automation service initialized")
         
-        from ai_integration.services import GeminiService
-        gemini_service = GeminiService()
+        from ai_integration.services import get_gemini_service
+        gemini_service = get_gemini_service()
         if gemini_service.enabled:
             print("   ✅ Gemini AI service enabled")
         else:
@@ -16,7 +16,7 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'notion_github_automation.settin
 import django
 django.setup()
 
-from ai_integration.services import GeminiService
+from ai_integration.services import get_gemini_service
 
 def test_gemini_integration():
     """Test Gemini AI service"""
@@ -30,7 +30,7 @@ def test_gemini_integration():
         'number': 1,
         'state': 'open',
         'assignee_login': 'AkilLabs',
-        'labels': [{'name': 'enhancement'}, {'name': 'good first issue'}],
+        'labels': ('enhancement', 'good first issue'),
         'body': 'This is a demo issue for testing the Chrome extension history functionality.',
         'html_url': 'https://github.com/AkilLabs/history-extension/issues/1',
         'created_at': '2025-01-01T10:00:00Z',
@@ -38,7 +38,7 @@ def test_gemini_integration():
     }
     
     try:
-        gemini_service = GeminiService()
+        gemini_service = get_gemini_service()
         
         if not gemini_service.enabled:
             print("❌ Gemini AI is not enabled. Please configure GEMINI_API_KEY in your .env file.")
@@ -16,15 +16,16 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'notion_github_automation.settin
 import django
 django.setup()
 
-from notion_client import Client
 from django.conf import settings
+from notion_integration.services import NotionService
 
 def test_notion_basic():
     """Test basic Notion connection"""
     print("🔍 Testing Notion API connection...")
     
     try:
-        client = Client(auth=settings.NOTION_TOKEN)
+        # Only the token is needed here; the database ID is what this script diagnoses
+        client = NotionService._shared_client(settings.NOTION_TOKEN)
         
         # Try to list databases (this should work if the token is valid)
         print("✅ Notion client initialized successfully")
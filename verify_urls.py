@@ -4,7 +4,9 @@ Verify repository URLs in the database
 """
 
 import os
+import sqlite3
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Add the project directory to Python path
@@ -16,58 +18,230 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'notion_github_automation.settin
 import django
 django.setup()
 
-from notion_client import Client
+import httpx
 from django.conf import settings
+from notion_client.errors import HTTPResponseError, RequestTimeoutError
+from notion_integration.services import get_notion_service
 
-def verify_repository_urls():
-    """Verify that repository URLs are correctly formatted"""
+# The only columns this script reads
+VERIFIED_PROPERTIES = ('Repository', 'Repository URL')
+
+# Titles and URLs of pages fetched on earlier runs, see verify_repository_urls
+PAGE_CACHE_PATH = project_dir / '.notion_cache.db'
+_page_cache = None
+
+def get_schema(client, database_id):
+    """Return the database's properties, keyed by property name"""
+    return client.databases.retrieve(database_id=database_id).get('properties', {})
+
+def make_page_extractor(schema):
+    """
+    Build a function returning a page's repository name and URL
+    
+    Every page shares the database schema, so whether each column exists with
+    the expected type is decided once here rather than re-checked per page.
+    """
+    title_name, url_name = VERIFIED_PROPERTIES
+    has_title = schema.get(title_name, {}).get('type') == 'title'
+    has_url = schema.get(url_name, {}).get('type') == 'url'
+    
+    def extract(page):
+        # A malformed page falls back to the defaults instead of aborting the run
+        try:
+            title = page['properties'][title_name]['title'][0]['plain_text'] if has_title else "Unknown"
+        except (KeyError, IndexError, TypeError):
+            title = "Unknown"
+        
+        try:
+            repo_url = page['properties'][url_name]['url'] if has_url else "No URL"
+        except (KeyError, TypeError):
+            repo_url = "No URL"
+        
+        return title, repo_url
+    
+    return extract
+
+def iter_query_batches(client, query):
+    """
+    Yield each batch of databases.query results across all cursor pages
+    
+    Cursors only come back with the previous page, so pages can't be fetched
+    in parallel; instead the next page is requested while the caller is still
+    working through the current one.
+    """
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        future = executor.submit(client.databases.query, **query)
+        
+        while True:
+            response = future.result()
+            if response.get('has_more'):
+                future = executor.submit(
+                    client.databases.query, **query, start_cursor=response.get('next_cursor')
+                )
+            yield response.get('results', [])
+            
+            if not response.get('has_more'):
+                break
+
+def iter_pages(client, query):
+    """Yield the query's pages one at a time, without collecting them into a list"""
+    for pages in iter_query_batches(client, query):
+        yield from pages
+
+def get_page_cache():
+    """Return the local cache of already-fetched page titles and URLs, opening it on first use"""
+    global _page_cache
+    
+    if _page_cache is None:
+        connection = sqlite3.connect(PAGE_CACHE_PATH)
+        with connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS pages ("
+                "database_id TEXT NOT NULL, id TEXT NOT NULL, last_edited TEXT NOT NULL, "
+                "title TEXT NOT NULL, url TEXT, PRIMARY KEY (database_id, id))"
+            )
+        _page_cache = connection
+    
+    return _page_cache
+
+def cached_since(connection, database_id):
+    """Return the newest last_edited_time cached for a database, or None if nothing is cached"""
+    return connection.execute(
+        "SELECT MAX(last_edited) FROM pages WHERE database_id = ?", (database_id,)
+    ).fetchone()[0]
+
+def store_pages(connection, database_id, pages, extract):
+    """
+    Cache the title and URL of fetched pages, replacing older copies
+    
+    Pages are consumed lazily, so an iterator is written as it is fetched.
+    Pages without an ID or edit time can't be cached and are skipped.
+    Returns the number of pages stored.
+    """
+    rows = (
+        (database_id, page['id'], page['last_edited_time'], *extract(page))
+        for page in pages
+        if isinstance(page, dict) and page.get('id') and page.get('last_edited_time')
+    )
+    
+    with connection:
+        return connection.executemany(
+            "INSERT OR REPLACE INTO pages (database_id, id, last_edited, title, url) VALUES (?, ?, ?, ?, ?)",
+            rows
+        ).rowcount
+
+# Report line for each URL category other than 'ok'
+STATUS_LINES = {
+    'issues': "   ❌ ISSUE: Contains '/issues/' - should be just repository URL",
+    'unknown': "   ⚠️  UNKNOWN: Unexpected URL format",
+    'too_long': "   ⚠️  UNKNOWN: URL too long",
+    'missing': "   ⚠️  MISSING: No repository URL found",
+}
+
+# Every correct repository URL starts with this, followed by <owner>/<repo>
+GITHUB_REPO_PREFIX = 'https://github.com/'
+
+# Longer values can't be real repository URLs and are rejected before parsing
+MAX_URL_LENGTH = 2048
+
+# One flagged page in the report, formatted in a single step
+BAD_PAGE_TEMPLATE = "%d. %s\n   URL: %s\n%s\n"
+
+def classify_url(repo_url):
+    """Return 'ok', 'issues', 'unknown', 'too_long' or 'missing' for a page's repository URL"""
+    if not repo_url or repo_url == "No URL":
+        return 'missing'
+    if len(repo_url) > MAX_URL_LENGTH:
+        return 'too_long'
+    
+    if "/issues/" in repo_url:
+        return 'issues'
+    if not repo_url.startswith(GITHUB_REPO_PREFIX):
+        return 'unknown'
+    
+    # Only the short tail after the prefix needs splitting
+    owner, _, repo = repo_url[len(GITHUB_REPO_PREFIX):].rstrip('/').partition('/')
+    return 'ok' if owner and repo and '/' not in repo else 'unknown'
+
+def verify_repository_urls(full=False):
+    """
+    Verify that repository URLs are correctly formatted
+    
+    Pages fetched on earlier runs are kept in a local cache, so later runs only
+    ask Notion for pages edited since then. Pass full=True (--full) to refetch
+    everything, e.g. after pages were archived or deleted.
+    """
     print("🔍 Verifying repository URLs in Notion database...")
     
     try:
-        client = Client(auth=settings.NOTION_TOKEN)
+        # Client and cache are created once per process, so repeated calls (e.g.
+        # when imported as a library) reuse them. Page queries share one keep-alive
+        # connection pool and responses are decoded with orjson
+        # (see notion_integration.services)
+        client = get_notion_service().client
         database_id = settings.NOTION_DATABASE_ID
+        cache = get_page_cache()
         
-        # Get all pages from the database
-        response = client.databases.query(database_id=database_id)
-        pages = response.get('results', [])
+        schema = get_schema(client, database_id)
+        extract = make_page_extractor(schema)
         
-        print(f"📊 Found {len(pages)} total pages in database")
-        print("\nRepository URLs:")
-        print("=" * 60)
+        # Only fetch the two columns checked below instead of every property
+        property_ids = [schema[name]['id'] for name in VERIFIED_PROPERTIES if name in schema]
         
-        for i, page in enumerate(pages, 1):
-            properties = page.get('properties', {})
-            
-            # Get repository name (title)
-            title_prop = properties.get('Repository', {})
-            title = "Unknown"
-            if title_prop.get('type') == 'title' and title_prop.get('title'):
-                title = title_prop['title'][0].get('plain_text', 'Unknown')
-            
-            # Get repository URL
-            url_prop = properties.get('Repository URL', {})
-            repo_url = "No URL"
-            if url_prop.get('type') == 'url':
-                repo_url = url_prop.get('url', 'No URL')
-            
-            print(f"{i}. {title}")
-            print(f"   URL: {repo_url}")
-            
-            # Check if URL format is correct
-            if repo_url and repo_url != "No URL":
-                if "/issues/" in repo_url:
-                    print("   ❌ ISSUE: Contains '/issues/' - should be just repository URL")
-                elif repo_url.startswith("https://github.com/") and repo_url.count("/") == 4:
-                    print("   ✅ CORRECT: Proper repository URL format")
-                else:
-                    print("   ⚠️  UNKNOWN: Unexpected URL format")
-            else:
-                print("   ⚠️  MISSING: No repository URL found")
-            
-            print()
+        query = {"database_id": database_id, "page_size": 100}
+        if property_ids:
+            query["filter_properties"] = property_ids
+        
+        since = None if full else cached_since(cache, database_id)
+        if since:
+            # Notion rounds edit times to the minute, so on_or_after can't miss an edit
+            query["filter"] = {"timestamp": "last_edited_time", "last_edited_time": {"on_or_after": since}}
+        else:
+            with cache:
+                cache.execute("DELETE FROM pages WHERE database_id = ?", (database_id,))
+        
+        # Stream the changed pages into the cache as they are fetched
+        fetched = store_pages(cache, database_id, iter_pages(client, query), extract)
+        
+        if since:
+            print(f"🔄 Fetched {fetched} page(s) edited since {since}")
+        
+        # Tally every page, keeping details only for the ones that need fixing
+        total = 0
+        counts = {'ok': 0, 'issues': 0, 'unknown': 0, 'too_long': 0, 'missing': 0}
+        bad = []
+        rows = cache.execute(
+            "SELECT title, url FROM pages WHERE database_id = ? ORDER BY rowid", (database_id,)
+        )
+        
+        for title, repo_url in rows:
+            total += 1
+            category = classify_url(repo_url)
+            counts[category] += 1
+            if category != 'ok':
+                bad.append((total, title, repo_url, category))
+        
+        out = [
+            f"📊 Found {total} total pages in database",
+            f"   ✅ Correct: {counts['ok']}",
+            f"   ❌ Issue URLs: {counts['issues']}",
+            f"   ⚠️  Unknown format: {counts['unknown'] + counts['too_long']}",
+            f"   ⚠️  Missing URL: {counts['missing']}",
+        ]
+        
+        if bad:
+            out.append("\nPages needing attention:")
+            out.append("=" * 60)
+            out.extend(
+                BAD_PAGE_TEMPLATE % (i, title, repo_url, STATUS_LINES[category])
+                for i, title, repo_url, category in bad
+            )
+        
+        sys.stdout.write('\n'.join(out) + '\n')
         
-    except Exception as e:
+    except (httpx.HTTPError, HTTPResponseError, RequestTimeoutError, sqlite3.Error, ValueError) as e:
+        # Network/API failures, an unusable cache file, or missing Notion settings
         print(f"❌ Failed to verify URLs: {e}")
 
 if __name__ == '__main__':
-    verify_repository_urls()
+    verify_repository_urls(full='--full' in sys.argv[1:])